@@ -0,0 +1,28 @@
+"""add members balance expression index
+
+Revision ID: a1f3c8e24b17
+Revises: 5d92ccb7bae0
+Create Date: 2026-02-14 09:12:31.482915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c8e24b17'
+down_revision = '5d92ccb7bae0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Expression index backing Member.balance_hours SQL-side filters
+    op.execute(
+        "CREATE INDEX ix_members_balance ON members "
+        "((total_hours_granted - total_hours_used))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_members_balance', table_name='members')
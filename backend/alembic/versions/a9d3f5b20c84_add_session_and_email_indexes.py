@@ -0,0 +1,52 @@
+"""add session query indexes and case-insensitive email index
+
+Revision ID: a9d3f5b20c84
+Revises: f2a6c81d4e07
+Create Date: 2026-02-24 10:12:44.907213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3f5b20c84'
+down_revision = 'f2a6c81d4e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index over open sessions only: the monitoring list filters
+    # time_end IS NULL and sorts by start time, and active rows are a
+    # tiny slice of history, so this stays small forever.
+    op.create_index(
+        'ix_gaming_sessions_open_start',
+        'gaming_sessions',
+        ['time_start'],
+        postgresql_where=sa.text('time_end IS NULL'),
+        sqlite_where=sa.text('time_end IS NULL')
+    )
+
+    # Per-member history pages: member_id filter + time ordering walk
+    # this composite in index order and stop at the page limit.
+    op.create_index(
+        'ix_gaming_sessions_member_time',
+        'gaming_sessions',
+        ['member_id', 'time_start']
+    )
+
+    # Case-insensitive login lookup (lower(email) = :email) straight off
+    # the index; unique so differently-cased duplicates can't register.
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_gaming_sessions_member_time', table_name='gaming_sessions')
+    op.drop_index('ix_gaming_sessions_open_start', table_name='gaming_sessions')
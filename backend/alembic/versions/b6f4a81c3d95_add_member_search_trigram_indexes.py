@@ -0,0 +1,52 @@
+"""add trigram indexes for member wildcard search
+
+Revision ID: b6f4a81c3d95
+Revises: e8b5d27f9a41
+Create Date: 2026-02-26 09:12:44.718305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f4a81c3d95'
+down_revision = 'e8b5d27f9a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Member search uses leading-wildcard ILIKE/LIKE on full_name and
+    # mobile, which B-tree indexes cannot serve - every search was a
+    # sequential scan. pg_trgm GIN indexes make those predicates
+    # index-accelerated with no query change. PostgreSQL-only: SQLite
+    # has no trigram support, and its dev-sized tables scan fine.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_members_full_name_trgm',
+        'members',
+        ['full_name'],
+        postgresql_using='gin',
+        postgresql_ops={'full_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_members_mobile_trgm',
+        'members',
+        ['mobile'],
+        postgresql_using='gin',
+        postgresql_ops={'mobile': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_members_mobile_trgm', table_name='members')
+    op.drop_index('ix_members_full_name_trgm', table_name='members')
@@ -0,0 +1,76 @@
+"""use native uuid columns
+
+Revision ID: b7d2e91c4f08
+Revises: a1f3c8e24b17
+Create Date: 2026-02-14 09:48:02.117263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e91c4f08'
+down_revision = 'a1f3c8e24b17'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs that hold UUIDs as String(36)
+_UUID_COLUMNS = [
+    ('branches', 'id'),
+    ('users', 'id'),
+    ('users', 'branch_id'),
+    ('refresh_tokens', 'id'),
+    ('refresh_tokens', 'user_id'),
+    ('members', 'id'),
+    ('members', 'branch_preferred_id'),
+    ('purchases', 'id'),
+    ('purchases', 'member_id'),
+    ('purchases', 'created_by'),
+    ('gaming_sessions', 'id'),
+    ('gaming_sessions', 'member_id'),
+    ('gaming_sessions', 'branch_id'),
+    ('gaming_sessions', 'created_by'),
+]
+
+
+def upgrade() -> None:
+    # Only PostgreSQL has a distinct 16-byte uuid type. Elsewhere the
+    # SQLAlchemy Uuid type still stores TEXT, but its bound values are
+    # undashed 32-hex - legacy rows written by the String(36) columns
+    # are dashed, so keyed lookups would miss every pre-migration row.
+    # Normalize the stored values to the undashed form instead of
+    # changing the column type.
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, column in _UUID_COLUMNS:
+            op.execute(
+                f"UPDATE {table} SET {column} = replace({column}, '-', '') "
+                f"WHERE {column} IS NOT NULL"
+            )
+        return
+
+    for table, column in _UUID_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE uuid USING {column}::uuid'
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        # Restore the dashed 8-4-4-4-12 layout String(36) wrote
+        for table, column in _UUID_COLUMNS:
+            op.execute(
+                f"UPDATE {table} SET {column} = "
+                f"substr({column}, 1, 8) || '-' || substr({column}, 9, 4) || '-' || "
+                f"substr({column}, 13, 4) || '-' || substr({column}, 17, 4) || '-' || "
+                f"substr({column}, 21) "
+                f"WHERE {column} IS NOT NULL AND length({column}) = 32"
+            )
+        return
+
+    for table, column in _UUID_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE varchar(36) USING {column}::text'
+        )
@@ -0,0 +1,39 @@
+"""add dashboard filter indexes
+
+Revision ID: c7e1b94a6f32
+Revises: a9d3f5b20c84
+Create Date: 2026-02-25 11:41:19.553087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1b94a6f32'
+down_revision = 'a9d3f5b20c84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Dashboard stats and expiring-member lists filter on branch plus an
+    # expiry window; one composite range scan instead of a table scan.
+    op.create_index(
+        'ix_members_branch_expiry',
+        'members',
+        ['branch_preferred_id', 'expiry_date']
+    )
+
+    # Per-member purchase history and the latest-purchase lookup in
+    # apply_rollover filter by member and order by purchase_date.
+    op.create_index(
+        'ix_purchases_member_date',
+        'purchases',
+        ['member_id', 'purchase_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchases_member_date', table_name='purchases')
+    op.drop_index('ix_members_branch_expiry', table_name='members')
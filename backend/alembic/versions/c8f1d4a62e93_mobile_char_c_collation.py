@@ -0,0 +1,51 @@
+"""mobile char(10) with C collation
+
+Revision ID: c8f1d4a62e93
+Revises: b7d2e91c4f08
+Create Date: 2026-02-14 10:21:45.903318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f1d4a62e93'
+down_revision = 'b7d2e91c4f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mobile is always exactly 10 ASCII digits after normalization, so on
+    # PostgreSQL store it as CHAR(10) COLLATE "C": index comparisons become
+    # byte-wise memcmp instead of locale-aware collation. SQLite stores
+    # strings as TEXT with binary comparison already, so nothing to do there.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        'ALTER TABLE members ALTER COLUMN mobile '
+        'TYPE char(10) COLLATE "C" USING mobile::char(10)'
+    )
+    # Enforce the digits-only invariant at the database level
+    op.execute(
+        "ALTER TABLE members ADD CONSTRAINT ck_members_mobile_digits "
+        "CHECK (mobile ~ '^[0-9]{10}$')"
+    )
+    op.execute(
+        "ALTER TABLE members ADD CONSTRAINT ck_members_mobile_length "
+        "CHECK (length(mobile) = 10)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE members DROP CONSTRAINT IF EXISTS ck_members_mobile_length')
+    op.execute('ALTER TABLE members DROP CONSTRAINT IF EXISTS ck_members_mobile_digits')
+    op.execute(
+        'ALTER TABLE members ALTER COLUMN mobile '
+        'TYPE varchar(10) USING mobile::varchar(10)'
+    )
@@ -0,0 +1,40 @@
+"""add session member/status indexes
+
+Revision ID: d4a9e7c51b36
+Revises: c8f1d4a62e93
+Create Date: 2026-02-14 10:52:18.664207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a9e7c51b36'
+down_revision = 'c8f1d4a62e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite index for the hot "active session for this member?" check,
+    # which filters on member_id AND status together.
+    op.create_index(
+        'ix_gaming_sessions_member_status',
+        'gaming_sessions',
+        ['member_id', 'status']
+    )
+    # Partial index covering only active rows (enum columns store the
+    # member NAME, so the stored value is 'ACTIVE').
+    op.create_index(
+        'ix_gaming_sessions_active',
+        'gaming_sessions',
+        ['member_id'],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+        sqlite_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_gaming_sessions_active', table_name='gaming_sessions')
+    op.drop_index('ix_gaming_sessions_member_status', table_name='gaming_sessions')
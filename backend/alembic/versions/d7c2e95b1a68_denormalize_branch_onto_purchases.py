@@ -0,0 +1,57 @@
+"""denormalize branch onto purchases
+
+Revision ID: d7c2e95b1a68
+Revises: b6f4a81c3d95
+Create Date: 2026-02-26 10:37:21.904112
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7c2e95b1a68'
+down_revision = 'b6f4a81c3d95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Branch-filtered revenue queries joined members on every purchase
+    # row just to read the branch. Carrying the branch on the purchase
+    # (written at purchase time) lets those aggregates filter on a
+    # purchase-local index with no join.
+    # Batch mode: SQLite cannot ALTER in an FK constraint, so the table
+    # is rebuilt there; on Postgres this emits a plain ALTER TABLE.
+    with op.batch_alter_table('purchases') as batch_op:
+        batch_op.add_column(
+            sa.Column('branch_id', sa.Uuid(as_uuid=False), nullable=True)
+        )
+        batch_op.create_foreign_key(
+            'fk_purchases_branch_id_branches',
+            'branches',
+            ['branch_id'],
+            ['id']
+        )
+
+    # Backfill from each purchase's member
+    op.execute(
+        "UPDATE purchases SET branch_id = ("
+        "SELECT branch_preferred_id FROM members "
+        "WHERE members.id = purchases.member_id)"
+    )
+
+    op.create_index(
+        'ix_purchases_branch_date',
+        'purchases',
+        ['branch_id', 'purchase_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchases_branch_date', table_name='purchases')
+    # Batch mode again: SQLite cannot drop a column that an FK
+    # references without rebuilding the table
+    with op.batch_alter_table('purchases') as batch_op:
+        batch_op.drop_constraint('fk_purchases_branch_id_branches', type_='foreignkey')
+        batch_op.drop_column('branch_id')
@@ -0,0 +1,33 @@
+"""add pending rollover partial index
+
+Revision ID: f2a6c81d4e07
+Revises: d4a9e7c51b36
+Create Date: 2026-02-21 09:34:02.118546
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6c81d4e07'
+down_revision = 'd4a9e7c51b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index for the daily expire-rollovers batch job: it only ever
+    # scans pending rows past their deadline, so indexing just those keeps
+    # the index tiny (enum columns store the member NAME, hence 'PENDING').
+    op.create_index(
+        'ix_purchases_pending_rollover',
+        'purchases',
+        ['rollover_deadline'],
+        postgresql_where=sa.text("rollover_status = 'PENDING'"),
+        sqlite_where=sa.text("rollover_status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchases_pending_rollover', table_name='purchases')
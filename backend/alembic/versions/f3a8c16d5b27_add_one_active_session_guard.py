@@ -0,0 +1,34 @@
+"""add unique one-active-session-per-member guard
+
+Revision ID: f3a8c16d5b27
+Revises: d7c2e95b1a68
+Create Date: 2026-02-26 13:58:02.481267
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c16d5b27'
+down_revision = 'd7c2e95b1a68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial unique index: at most one open session (time_end IS NULL)
+    # per member, enforced by the database so concurrent session starts
+    # cannot both slip past the application-level check.
+    op.create_index(
+        'uq_gaming_sessions_one_active',
+        'gaming_sessions',
+        ['member_id'],
+        unique=True,
+        postgresql_where=sa.text('time_end IS NULL'),
+        sqlite_where=sa.text('time_end IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_gaming_sessions_one_active', table_name='gaming_sessions')
@@ -1,16 +1,97 @@
 """
 JWT token creation and validation for UNTANGLE.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+import asyncio
+import math
+import os
+import threading
+import time
+
+from cachetools import TTLCache
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 
 from ..config import settings
 
+# Signing key prepared once at import. Passing the raw secret string to
+# jwt.encode/decode makes jose rebuild an HMACKey (including a PEM
+# detection pass over the secret) on every call; a prebuilt key object
+# skips that on every token issued and every request verified. The
+# algorithm list for decode is hoisted for the same reason.
+_SIGNING_KEY = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+_DECODE_ALGORITHMS = [settings.ALGORITHM]
+
+# Token lifetimes are fixed by settings; build the timedeltas once
+# instead of per token
+_ACCESS_TOKEN_LIFETIME = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TOKEN_LIFETIME = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Dedicated pool for password hashing. bcrypt is deliberately slow
+# (~100ms per verify after calibration) and releases the GIL, so running
+# it inline on the event loop would stall every concurrent request for
+# the duration of each login. Sized to cpu_count*2 since hashing
+# saturates cores - a bigger pool would just queue on the CPU anyway.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="pwd-hash"
+)
+
+# Successfully verified payloads keyed by (token, type). The same access
+# token is verified on every request it makes, so a short-TTL cache
+# skips the repeated HMAC + base64 + claims parse; expiry is re-checked
+# on every hit since jose only validates 'exp' at decode time.
+_verify_cache: TTLCache = TTLCache(maxsize=8192, ttl=60)
+_verify_cache_lock = threading.Lock()
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float = 100.0,
+    samples: int = 3,
+    min_rounds: int = 10,
+    max_rounds: int = 14
+) -> int:
+    """
+    Pick a bcrypt work factor sized for this host and apply it.
+
+    bcrypt cost doubles per round, so a fixed rounds value is either too
+    weak on fast hardware or burns CPU on every login on slow hardware.
+    This times a few hashes at the current rounds, takes the fastest
+    sample (least scheduler noise), and shifts the rounds so a verify
+    lands near target_ms. Call once at application startup; verification
+    of existing hashes is unaffected (bcrypt stores rounds in the hash).
+
+    Args:
+        target_ms: Desired per-verify cost in milliseconds
+        samples: Number of timing samples to take
+        min_rounds: Lower clamp for the chosen work factor
+        max_rounds: Upper clamp for the chosen work factor
+
+    Returns:
+        int: The rounds value now used for new password hashes
+    """
+    # passlib leaves rounds unset until explicitly configured; bcrypt's
+    # own default cost is 12
+    base_rounds = pwd_context.handler("bcrypt").rounds or 12
+
+    best_ms = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        pwd_context.hash("calibration-probe")
+        best_ms = min(best_ms, (time.perf_counter() - start) * 1000)
+
+    # Each additional round doubles the cost, so the shift is log2
+    shift = round(math.log2(target_ms / best_ms)) if best_ms > 0 else 0
+    rounds = max(min_rounds, min(max_rounds, base_rounds + shift))
+
+    pwd_context.update(bcrypt__rounds=rounds)
+    return rounds
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -39,6 +120,43 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing thread pool.
+
+    Async request handlers must use this instead of verify_password:
+    the bcrypt work runs off the event loop, so other requests keep
+    being served during the ~100ms verify.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the hashing thread pool.
+
+    Async counterpart of get_password_hash; see verify_password_async.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        str: Hashed password
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, get_password_hash, password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -55,10 +173,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.utcnow() + _ACCESS_TOKEN_LIFETIME
 
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=settings.ALGORITHM)
 
     return encoded_jwt
 
@@ -79,10 +197,10 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = datetime.utcnow() + _REFRESH_TOKEN_LIFETIME
 
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=settings.ALGORITHM)
 
     return encoded_jwt
 
@@ -98,7 +216,7 @@ def decode_token(token: str) -> Optional[dict]:
         dict: Decoded token payload or None if invalid
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=_DECODE_ALGORITHMS)
         return payload
     except JWTError:
         return None
@@ -108,6 +226,10 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """
     Verify a JWT token and check its type.
 
+    Repeat verifications of the same token are served from a short-TTL
+    cache (with the expiry claim re-checked on each hit) instead of
+    re-running signature verification.
+
     Args:
         token: JWT token string
         token_type: Expected token type ('access' or 'refresh')
@@ -115,6 +237,19 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     Returns:
         dict: Decoded token payload or None if invalid/wrong type
     """
+    cache_key = (token, token_type)
+
+    with _verify_cache_lock:
+        payload = _verify_cache.get(cache_key)
+
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is not None and time.time() >= exp:
+            with _verify_cache_lock:
+                _verify_cache.pop(cache_key, None)
+            return None
+        return payload
+
     payload = decode_token(token)
 
     if payload is None:
@@ -123,4 +258,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     if payload.get("type") != token_type:
         return None
 
+    with _verify_cache_lock:
+        _verify_cache[cache_key] = payload
+
     return payload
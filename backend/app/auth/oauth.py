@@ -2,11 +2,41 @@
 Google OAuth integration for UNTANGLE.
 """
 from typing import Optional
+from urllib.parse import urlencode
 import httpx
 from fastapi import HTTPException, status
 
 from ..config import settings
 
+# Shared HTTP client for all Google OAuth calls.
+# Reusing one client keeps TCP+TLS connections alive between requests
+# (with HTTP/2 multiplexing), instead of paying a full handshake per call.
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+
+# Constant OAuth parameters, folded once at import. Only redirect_uri and
+# state vary per call, so get_google_oauth_url just appends those.
+_BASE_AUTH_PARAMS = (
+    ("client_id", settings.GOOGLE_CLIENT_ID),
+    ("response_type", "code"),
+    ("scope", "openid email profile"),
+    ("access_type", "offline"),
+    ("prompt", "consent"),
+)
+
+
+async def close_oauth_client() -> None:
+    """
+    Close the shared OAuth HTTP client.
+
+    Called from the application shutdown handler in main.py.
+    """
+    await _client.aclose()
+
 
 async def get_google_user_info(access_token: str) -> dict:
     """
@@ -21,19 +51,18 @@ async def get_google_user_info(access_token: str) -> dict:
     Raises:
         HTTPException: If unable to fetch user info
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/oauth2/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"}
+    response = await _client.get(
+        "https://www.googleapis.com/oauth2/v2/userinfo",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to fetch user information from Google"
         )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to fetch user information from Google"
-            )
-
-        return response.json()
+    return response.json()
 
 
 async def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
@@ -50,25 +79,24 @@ async def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
     Raises:
         HTTPException: If unable to exchange code
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": redirect_uri,
-                "grant_type": "authorization_code",
-            }
+    response = await _client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "redirect_uri": redirect_uri,
+            "grant_type": "authorization_code",
+        }
+    )
+
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code"
         )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange authorization code"
-            )
-
-        return response.json()
+    return response.json()
 
 
 def get_google_oauth_url(redirect_uri: str, state: Optional[str] = None) -> str:
@@ -83,17 +111,12 @@ def get_google_oauth_url(redirect_uri: str, state: Optional[str] = None) -> str:
         str: Google OAuth authorization URL
     """
     base_url = "https://accounts.google.com/o/oauth2/v2/auth"
-    params = {
-        "client_id": settings.GOOGLE_CLIENT_ID,
-        "redirect_uri": redirect_uri,
-        "response_type": "code",
-        "scope": "openid email profile",
-        "access_type": "offline",
-        "prompt": "consent",
-    }
+    params = list(_BASE_AUTH_PARAMS)
+    params.append(("redirect_uri", redirect_uri))
 
     if state:
-        params["state"] = state
+        params.append(("state", state))
 
-    query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-    return f"{base_url}?{query_string}"
+    # urlencode is a single C-backed call and correctly escapes values
+    # (the old manual join left the scope/redirect URI unencoded)
+    return f"{base_url}?{urlencode(params)}"
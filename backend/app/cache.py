@@ -0,0 +1,273 @@
+"""
+UNTANGLE - Read-through cache for dashboard aggregates.
+
+Dashboard endpoints are polled by the frontend, re-running the same
+aggregate queries every few seconds. Results here are cached for a short
+TTL under keys derived from the function name and its arguments, and
+writes that change the aggregates (purchases, rollovers) invalidate the
+whole namespace.
+
+When REDIS_URL is configured the cache is shared across workers via
+Redis; otherwise a process-local TTLCache is used. Redis errors never
+fail a request - the cached function just runs normally.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from .config import settings
+
+try:
+    import redis as _redis
+except ImportError:  # pragma: no cover - redis is in requirements
+    _redis = None
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "dash:"
+
+_redis_client = None
+if settings.REDIS_URL and _redis is not None:
+    # decode_responses stays off (the library default, pinned here on
+    # purpose): cached values are orjson bytes and go back on the wire
+    # as bytes, so decoding to str on read would just add a UTF-8 pass
+    # that the next serialization undoes.
+    _redis_client = _redis.Redis.from_url(settings.REDIS_URL, decode_responses=False)
+
+
+def get_redis_client():
+    """
+    Return the shared Redis client, or None when Redis is not configured.
+
+    Other modules (e.g. the auth token denylist) share this client so the
+    whole process keeps a single connection pool.
+    """
+    return _redis_client
+
+# Process-local fallback when Redis is not configured. Entries carry their
+# own expiry via the decorator TTL; 60 s here is just the upper bound.
+_local_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_local_cache_lock = threading.Lock()
+
+
+def _make_key(name: str, kwargs: dict) -> str:
+    """Build a stable cache key from the function name and its kwargs."""
+    parts = ",".join(f"{k}={kwargs[k]}" for k in sorted(kwargs))
+    return f"{_KEY_PREFIX}{name}:{parts}"
+
+
+def _cache_read(key: str) -> Optional[bytes]:
+    """Fetch a raw cached payload, from Redis or the local fallback."""
+    if _redis_client is not None:
+        try:
+            return _redis_client.get(key)
+        except Exception:
+            logger.warning("Redis read failed for %s; querying directly", key)
+            return None
+
+    with _local_cache_lock:
+        return _local_cache.get(key)
+
+
+def _try_refresh_lock(key: str) -> bool:
+    """
+    Try to claim the refresh lock for a missing Redis entry.
+
+    Stampede mitigation: on a shared miss only the lock holder
+    recomputes; the others briefly wait for the refreshed entry before
+    falling through to their own query. Always claims when Redis is not
+    in play (the local cache is per-process, so stampedes are bounded).
+    """
+    if _redis_client is None:
+        return True
+    try:
+        return bool(_redis_client.set(f"{key}:lock", 1, nx=True, ex=5))
+    except Exception:
+        return True
+
+
+def _cache_write(key: str, payload: bytes, ttl: int) -> None:
+    """Store a raw payload, in Redis or the local fallback."""
+    if _redis_client is not None:
+        try:
+            _redis_client.set(key, payload, ex=ttl)
+            _redis_client.delete(f"{key}:lock")
+        except Exception:
+            logger.warning("Redis write failed for %s", key)
+        return
+
+    with _local_cache_lock:
+        _local_cache[key] = payload
+
+
+def cached_aggregate(name: str, ttl: int = 60) -> Callable:
+    """
+    Decorator: cache a service function's JSON-serializable result.
+
+    The wrapped function must take the database session as its first
+    positional argument and everything else as keyword arguments (which
+    is how the dashboard routers call the service layer).
+
+    Cached values round-trip through orjson, so Decimals and dates come
+    back as strings - the Pydantic response schemas coerce them on the
+    way out.
+
+    Args:
+        name: Cache key namespace for this function
+        ttl: Seconds before the entry expires
+
+    Returns:
+        Callable: Decorated function
+    """
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(db, **kwargs):
+                key = _make_key(name, kwargs)
+
+                raw = _cache_read(key)
+                if raw is not None:
+                    return orjson.loads(raw)
+
+                if not _try_refresh_lock(key):
+                    await asyncio.sleep(0.05)
+                    raw = _cache_read(key)
+                    if raw is not None:
+                        return orjson.loads(raw)
+
+                result = await fn(db, **kwargs)
+                _cache_write(key, orjson.dumps(result, default=str), ttl)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(db, **kwargs):
+            key = _make_key(name, kwargs)
+
+            raw = _cache_read(key)
+            if raw is not None:
+                return orjson.loads(raw)
+
+            if not _try_refresh_lock(key):
+                time.sleep(0.05)
+                raw = _cache_read(key)
+                if raw is not None:
+                    return orjson.loads(raw)
+
+            result = fn(db, **kwargs)
+            _cache_write(key, orjson.dumps(result, default=str), ttl)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def cached_count(key: str, compute: Callable[[], int], ttl: int = 60) -> int:
+    """
+    Read-through cache for expensive COUNT(*) totals.
+
+    Offset-paginated list endpoints re-run an identical COUNT on every
+    page request; on large tables that count is the dominant cost. Totals
+    change slowly relative to how often they are read, so a short TTL is
+    an acceptable staleness window - and write paths invalidate their
+    namespace anyway (see invalidate_count_cache).
+
+    Args:
+        key: Full cache key, e.g. "v1:sessions:count:member=...:active=False"
+        compute: Zero-argument callable producing the count (e.g. query.count)
+        ttl: Seconds before the entry expires
+
+    Returns:
+        int: Cached or freshly computed count
+    """
+    cached = get_cached_count(key)
+    if cached is not None:
+        return cached
+
+    count = compute()
+    store_cached_count(key, count, ttl)
+    return count
+
+
+def get_cached_count(key: str) -> Optional[int]:
+    """
+    Return a cached count, or None on a miss.
+
+    Split out from cached_count so async callers can run their own
+    (awaited) count query on a miss and store the result afterwards.
+    """
+    if _redis_client is not None:
+        try:
+            raw = _redis_client.get(key)
+            if raw is not None:
+                return int(raw)
+        except Exception:
+            logger.warning("Redis read failed for %s; counting directly", key)
+        return None
+
+    with _local_cache_lock:
+        return _local_cache.get(key)
+
+
+def store_cached_count(key: str, count: int, ttl: int = 60) -> None:
+    """Store a freshly computed count under its cache key."""
+    if _redis_client is not None:
+        try:
+            _redis_client.set(key, count, ex=ttl)
+        except Exception:
+            logger.warning("Redis write failed for %s", key)
+        return
+
+    with _local_cache_lock:
+        _local_cache[key] = count
+
+
+def invalidate_count_cache(prefix: str) -> None:
+    """
+    Drop every cached count under a key prefix.
+
+    Called from write paths (e.g. session start/end) so the next page
+    request recounts instead of serving a stale total for up to the TTL.
+
+    Args:
+        prefix: Key namespace to clear, e.g. "v1:sessions:count:"
+    """
+    with _local_cache_lock:
+        stale = [k for k in _local_cache if k.startswith(prefix)]
+        for k in stale:
+            _local_cache.pop(k, None)
+
+    if _redis_client is not None:
+        try:
+            keys = list(_redis_client.scan_iter(f"{prefix}*"))
+            if keys:
+                _redis_client.delete(*keys)
+        except Exception:
+            logger.warning("Redis count-cache invalidation failed for %s*", prefix)
+
+
+def invalidate_dashboard_cache() -> None:
+    """
+    Drop every cached dashboard aggregate.
+
+    Called from write paths that change what the dashboard reports
+    (new purchases, rollovers), so polling clients see fresh numbers on
+    their next request instead of waiting out the TTL.
+    """
+    with _local_cache_lock:
+        _local_cache.clear()
+
+    if _redis_client is not None:
+        try:
+            keys = list(_redis_client.scan_iter(f"{_KEY_PREFIX}*"))
+            if keys:
+                _redis_client.delete(*keys)
+        except Exception:
+            logger.warning("Redis dashboard-cache invalidation failed")
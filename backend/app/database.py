@@ -1,26 +1,115 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
 
-# Create database engine
+logger = logging.getLogger(__name__)
+
+# Create database engine.
+# Sized for burst load: with the default pool (5 + 10 overflow), ~100
+# concurrent requests each holding a Depends(get_db) session can exhaust
+# the pool and stall on QueuePool checkout. pool_recycle keeps idle
+# connections younger than typical server/firewall idle timeouts.
+# pool_use_lifo hands out the most recently returned connection, so
+# under light load the excess connections actually sit idle long enough
+# for pool_recycle to retire them instead of the whole pool staying
+# lukewarm. Note: pool_size + max_overflow is PER PROCESS - keep
+# (pool_size + max_overflow) * worker count under the database's
+# max_connections (see start.py).
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    pool_use_lifo=True
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class. expire_on_commit=False (matching the async
+# sessionmaker below): sessions are request-scoped and read their
+# instances right after the single commit, so expiring every attribute
+# at commit just forces a reload SELECT per instance touched. Server-
+# generated values are already fetched at flush via eager_defaults
+# (see models.base.TimestampMixin).
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+# Optional read replica for analytics. Dashboard aggregates and exports
+# are read-only and already tolerate short staleness (their results are
+# cached for 30-60 s), so replication lag is acceptable - routing them
+# here keeps large aggregate scans off the primary. With no replica
+# configured this is the primary engine and behavior is unchanged.
+if settings.READ_REPLICA_URL:
+    read_engine = create_engine(
+        settings.READ_REPLICA_URL,
+        pool_pre_ping=True,
+        pool_size=20,
+        max_overflow=40,
+        pool_recycle=1800,
+        pool_use_lifo=True
+    )
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+def _async_database_url(url: str) -> str:
+    """Map the configured DATABASE_URL to its asyncio driver equivalent."""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# Async engine/session used by hot async code paths (e.g. get_current_user),
+# so their SQL awaits instead of blocking the event loop.
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    pool_use_lifo=True
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 # Create Base class for models
 Base = declarative_base()
 
 
+if settings.ENVIRONMENT == "development":
+    @event.listens_for(Session, "do_orm_execute")
+    def _warn_on_lazy_load(orm_execute_state) -> None:
+        """
+        Flag lazy relationship loads in development (N+1 guard).
+
+        Every relationship traversal in the services should go through
+        an explicit eager-load (selectinload/joinedload) or a targeted
+        column select; a lazy load firing means a new code path slipped
+        one in and will issue a query per parent row in lists.
+        lazy_loaded_from is only set for true lazy loads, so the
+        intended selectinload batches don't trip this.
+        """
+        if (
+            orm_execute_state.is_relationship_load
+            and orm_execute_state.lazy_loaded_from is not None
+        ):
+            logger.warning(
+                "Lazy relationship load: %s -> %s (possible N+1; eager-load "
+                "this relationship on the originating query)",
+                orm_execute_state.lazy_loaded_from.class_.__name__,
+                orm_execute_state.bind_mapper.class_.__name__
+            )
+
+
 def get_db():
     """
     Dependency that provides a database session.
@@ -31,3 +120,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency that provides a read-only session on the replica.
+
+    Identical to get_db when READ_REPLICA_URL is not configured. Only
+    for endpoints that never write and tolerate replication lag.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency that provides an async database session.
+    Yields a session and closes it after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
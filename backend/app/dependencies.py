@@ -2,11 +2,16 @@
 UNTANGLE - FastAPI Dependencies
 """
 from typing import List, Callable
-from fastapi import Depends, HTTPException, status
+import threading
+import time
+
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .database import get_db as _get_db
+from .database import get_db as _get_db, get_async_db
 from .models.user import User
 from .auth.jwt import verify_token
 from .services import auth_service
@@ -18,17 +23,43 @@ get_db = _get_db
 # OAuth2 scheme for bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Short-lived cache of verified tokens: token -> (user_id, token_expiry_ts).
+# A hit skips the HMAC signature check and the user lookup query that
+# otherwise run identically on every authenticated request for the same token.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
+
+
+def invalidate_token(token: str) -> None:
+    """
+    Drop a token from the verification cache (e.g., on logout/revoke).
+
+    Args:
+        token: Raw token string to invalidate
+    """
+    with _token_cache_lock:
+        _token_cache.pop(token, None)
+
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get current authenticated user from JWT token.
 
+    Uses the async session so the user lookup awaits instead of blocking
+    the event loop. Verified tokens are cached for a short TTL (bounded by
+    the token's own expiry) so repeat requests skip signature verification.
+    The resolved user is also memoized on request.state, so when several
+    dependencies in one route resolve the user (require_role plus the
+    handler's own current_user) the database is hit at most once.
+
     Args:
+        request: Current request (used to memoize the resolved user)
         token: JWT access token
-        db: Database session
+        db: Async database session
 
     Returns:
         User: Current authenticated user
@@ -36,22 +67,40 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    payload = verify_token(token, token_type="access")
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+
+    if cached is not None:
+        user_id, expiry_ts = cached
+        if expiry_ts is not None and time.time() >= expiry_ts:
+            invalidate_token(token)
+            raise UnauthorizedException("Could not validate credentials")
+    else:
+        payload = verify_token(token, token_type="access")
 
-    if not payload:
-        raise UnauthorizedException("Could not validate credentials")
+        if not payload:
+            raise UnauthorizedException("Could not validate credentials")
 
-    user_id = payload.get("sub")
-    if not user_id:
-        raise UnauthorizedException("Could not validate credentials")
+        user_id = payload.get("sub")
+        if not user_id:
+            raise UnauthorizedException("Could not validate credentials")
 
-    user = auth_service.get_user_by_id(db, user_id)
+        with _token_cache_lock:
+            _token_cache[token] = (user_id, payload.get("exp"))
+
+    # Session.get() hits the identity map / primary-key path
+    user = await db.get(User, user_id)
     if not user:
         raise NotFoundException("User", user_id)
 
     if not user.is_active:
         raise UnauthorizedException("User account is inactive")
 
+    request.state.user = user
     return user
 
 
@@ -81,6 +130,10 @@ def require_role(allowed_roles: List[str]) -> Callable:
     """
     Dependency factory for role-based access control.
 
+    The allowed-role set and error detail are precomputed once when the
+    router is defined, so the per-request check is a single O(1) set
+    membership test with no string formatting.
+
     Args:
         allowed_roles: List of role names that are allowed (e.g., ["admin", "manager"])
 
@@ -92,12 +145,15 @@ def require_role(allowed_roles: List[str]) -> Callable:
         async def admin_endpoint():
             return {"message": "Admin access granted"}
     """
+    allowed = frozenset(allowed_roles)
+    detail = f"Access denied. Required roles: {', '.join(allowed_roles)}"
+
     async def role_checker(current_user: User = Depends(get_current_user)):
         """Check if current user has required role."""
-        if current_user.role not in allowed_roles:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {', '.join(allowed_roles)}"
+                detail=detail
             )
         return current_user
 
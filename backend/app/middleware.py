@@ -0,0 +1,126 @@
+"""
+UNTANGLE - Custom ASGI Middleware
+"""
+import time
+import threading
+from typing import Optional, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.middleware.cors import CORSMiddleware as _StarletteCORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class CORSMiddleware(_StarletteCORSMiddleware):
+    """
+    CORS middleware with O(1) origin checks.
+
+    Starlette keeps allow_origins as a list and does a linear scan per
+    request; converting to a frozenset makes the membership test a hash
+    lookup. Behaviour is otherwise identical.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.allow_all_origins:
+            self.allow_origins = frozenset(self.allow_origins)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Short-TTL in-process cache for idempotent GET endpoints.
+
+    Cached GETs (e.g. /health and the dashboard aggregates) are answered
+    straight from memory, skipping the route handler and its SQL entirely.
+    Any non-GET request invalidates the cached entries, so writes are
+    reflected on the next read.
+
+    The cache key includes the Authorization header, so a cached response
+    is only ever replayed to the caller that originally produced it.
+    """
+
+    def __init__(
+        self,
+        app,
+        cached_paths: Tuple[str, ...] = (),
+        cached_prefixes: Tuple[str, ...] = (),
+        excluded_prefixes: Tuple[str, ...] = (),
+        ttl: float = 30.0
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            app: Wrapped ASGI application
+            cached_paths: Exact paths to cache (e.g. ("/health", "/"))
+            cached_prefixes: Path prefixes to cache (e.g. ("/api/v1/dashboard/",))
+            excluded_prefixes: Path prefixes never cached even when they
+                fall under cached_prefixes (e.g. streamed exports)
+            ttl: Cache lifetime in seconds
+        """
+        super().__init__(app)
+        self.cached_paths = frozenset(cached_paths)
+        self.cached_prefixes = tuple(cached_prefixes)
+        self.excluded_prefixes = tuple(excluded_prefixes)
+        self.ttl = ttl
+        self._cache: dict = {}
+        self._lock = threading.Lock()
+
+    def _is_cacheable(self, path: str) -> bool:
+        """Check whether a path is configured for caching."""
+        if any(path.startswith(prefix) for prefix in self.excluded_prefixes):
+            return False
+        if path in self.cached_paths:
+            return True
+        return any(path.startswith(prefix) for prefix in self.cached_prefixes)
+
+    def _get_cached(self, key: tuple) -> Optional[Response]:
+        """Return a cached response if present and not expired."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, status_code, headers, body = entry
+            if time.monotonic() >= expires_at:
+                del self._cache[key]
+                return None
+
+        return Response(content=body, status_code=status_code, headers=headers)
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        """Serve cached GETs; invalidate the cache on writes."""
+        path = request.url.path
+
+        if request.method != "GET":
+            # Writes may change anything the cached reads report
+            with self._lock:
+                self._cache.clear()
+            return await call_next(request)
+
+        if not self._is_cacheable(path):
+            return await call_next(request)
+
+        key = (path, request.url.query, request.headers.get("authorization"))
+
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        response = await call_next(request)
+
+        if response.status_code == 200:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            with self._lock:
+                self._cache[key] = (
+                    time.monotonic() + self.ttl,
+                    response.status_code,
+                    dict(response.headers),
+                    body
+                )
+            return Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers)
+            )
+
+        return response
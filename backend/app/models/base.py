@@ -2,18 +2,40 @@
 Base models and mixins for database models.
 """
 from datetime import datetime
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Uuid
+from sqlalchemy.sql import func
 import uuid
 
 
 class TimestampMixin:
-    """Mixin that adds created_at and updated_at timestamps."""
+    """
+    Mixin that adds created_at and updated_at timestamps.
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    Timestamps are generated by the database (server_default=func.now())
+    so inserts skip a Python datetime allocation and parameter bind.
+    onupdate stays Python-side as a fallback for SQLite, which has no
+    server-side on-update hook without a trigger.
+
+    eager_defaults makes flushes fetch server-generated values (these
+    timestamps, Computed columns like Member.balance_hours) via
+    RETURNING in the same statement, so services don't need a
+    db.refresh round-trip after commit. Every model uses this mixin, so
+    it applies mapper-wide.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow, nullable=False)
 
 
 class UUIDMixin:
-    """Mixin that adds a UUID primary key (String-based for SQLite compatibility)."""
+    """
+    Mixin that adds a UUID primary key.
+
+    Uses the dialect-native UUID type (16-byte binary on PostgreSQL, TEXT
+    on SQLite). as_uuid=False keeps Python-side values as strings so the
+    services/schemas keep working with plain string IDs.
+    """
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
@@ -1,7 +1,7 @@
 """
 Member model for gaming hub customers.
 """
-from sqlalchemy import Column, String, DECIMAL, Date, ForeignKey
+from sqlalchemy import Column, Computed, String, CHAR, DECIMAL, Date, ForeignKey, Index, Uuid, func, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 # UUID import removed for SQLite compatibility
@@ -24,9 +24,23 @@ class Member(Base, UUIDMixin, TimestampMixin):
     - Mobile numbers are normalized to 10-digit format
     """
     __tablename__ = "members"
-
-    # Primary lookup key - normalized 10-digit mobile number
-    mobile = Column(String(10), unique=True, index=True, nullable=False)
+    __table_args__ = (
+        # Normalization should make this unreachable; the DB enforces it anyway
+        CheckConstraint("length(mobile) = 10", name="ck_members_mobile_length"),
+        # Dashboard stats and expiring-member lists filter by branch and
+        # expiry window together; the composite turns those into one
+        # index range scan instead of a table scan.
+        Index("ix_members_branch_expiry", "branch_preferred_id", "expiry_date"),
+    )
+
+    # Primary lookup key - normalized 10-digit mobile number.
+    # On PostgreSQL use CHAR(10) with "C" collation: the value is always
+    # exactly 10 ASCII digits, so index comparisons become plain memcmp
+    # instead of locale-aware collation on the hottest lookup path.
+    mobile = Column(
+        String(10).with_variant(CHAR(10, collation='C'), "postgresql"),
+        unique=True, index=True, nullable=False
+    )
 
     # Profile information
     full_name = Column(String, nullable=False)
@@ -36,7 +50,17 @@ class Member(Base, UUIDMixin, TimestampMixin):
     current_plan = Column(String, nullable=True)  # Latest plan name
     total_hours_granted = Column(DECIMAL(10, 2), default=Decimal('0.00'), nullable=False)
     total_hours_used = Column(DECIMAL(10, 2), default=Decimal('0.00'), nullable=False)
-    # balance_hours is computed via hybrid_property below
+
+    # Stored generated column: the database derives and persists the
+    # balance on every write, so it can never drift and balance filters
+    # or sorts can use an index instead of computing granted - used per
+    # row. Still never written by the application - only the two source
+    # columns are. (Instances read the value as loaded; it refreshes
+    # from the DB after flush like any server-computed default.)
+    balance_hours = Column(
+        DECIMAL(10, 2),
+        Computed("total_hours_granted - total_hours_used", persisted=True)
+    )
 
     # Expiry tracking
     expiry_date = Column(Date, nullable=True, index=True)
@@ -45,22 +69,13 @@ class Member(Base, UUIDMixin, TimestampMixin):
     registration_date = Column(Date, nullable=False)
 
     # Branch preference
-    branch_preferred_id = Column(String(36), ForeignKey("branches.id"), nullable=True)
+    branch_preferred_id = Column(Uuid(as_uuid=False), ForeignKey("branches.id"), nullable=True)
 
     # Relationships
     branch_preferred = relationship("Branch", back_populates="members")
     purchases = relationship("Purchase", back_populates="member", cascade="all, delete-orphan", order_by="Purchase.purchase_date.desc()")
     sessions = relationship("GamingSession", back_populates="member", cascade="all, delete-orphan")
 
-    @hybrid_property
-    def balance_hours(self) -> Decimal:
-        """
-        Real-time balance calculation.
-
-        Formula: total_hours_granted - total_hours_used
-        """
-        return self.total_hours_granted - self.total_hours_used
-
     @hybrid_property
     def is_expired(self) -> bool:
         """
@@ -72,5 +87,21 @@ class Member(Base, UUIDMixin, TimestampMixin):
             return False
         return date.today() > self.expiry_date
 
+    @is_expired.expression
+    def is_expired(cls):
+        """SQL expression so expiry filters run in the database."""
+        return cls.expiry_date < func.current_date()
+
+    def is_expired_on(self, today: date) -> bool:
+        """
+        Check expiry against a caller-supplied date.
+
+        Loops rendering many members should call date.today() once and
+        pass it here, instead of paying a syscall per row via is_expired.
+        """
+        if not self.expiry_date:
+            return False
+        return today > self.expiry_date
+
     def __repr__(self):
         return f"<Member {self.mobile} - {self.full_name} ({self.balance_hours}h remaining)>"
@@ -3,7 +3,7 @@ Purchase model for credit/plan transactions.
 
 CRITICAL BUSINESS LOGIC: 180-day rollover + 365-day expiry
 """
-from sqlalchemy import Column, String, DECIMAL, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Index, String, DECIMAL, Date, DateTime, ForeignKey, Uuid, func, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 # UUID import removed for SQLite compatibility
@@ -36,10 +36,32 @@ class Purchase(Base, UUIDMixin, TimestampMixin):
        - Otherwise, unused hours are forfeited
     """
     __tablename__ = "purchases"
+    __table_args__ = (
+        # Partial index for the daily expire-rollovers batch job, which
+        # scans only pending rows past their deadline (enum columns store
+        # the member NAME, so the stored value is 'PENDING')
+        Index(
+            "ix_purchases_pending_rollover",
+            "rollover_deadline",
+            postgresql_where=text("rollover_status = 'PENDING'"),
+            sqlite_where=text("rollover_status = 'PENDING'")
+        ),
+        # Per-member purchase history and the latest-purchase lookup in
+        # apply_rollover both filter by member and order by date; the
+        # composite serves filter + sort from one scan.
+        Index("ix_purchases_member_date", "member_id", "purchase_date"),
+        # Branch-filtered revenue queries hit this directly instead of
+        # joining members per row (see branch_id below).
+        Index("ix_purchases_branch_date", "branch_id", "purchase_date"),
+    )
 
     # Member linkage
-    member_id = Column(String(36), ForeignKey("members.id", ondelete="CASCADE"), nullable=False, index=True)
+    member_id = Column(Uuid(as_uuid=False), ForeignKey("members.id", ondelete="CASCADE"), nullable=False, index=True)
     mobile = Column(String(10), nullable=False)  # Denormalized for quick lookup
+    # Denormalized from the member's preferred branch at purchase time,
+    # so branch-filtered revenue aggregates don't join members for every
+    # row. Plain filter key - no relationship on purpose.
+    branch_id = Column(Uuid(as_uuid=False), ForeignKey("branches.id"), nullable=True)
 
     # Plan details
     plan_name = Column(String, nullable=False)  # e.g., "60 Hours Premium"
@@ -63,7 +85,7 @@ class Purchase(Base, UUIDMixin, TimestampMixin):
     )
 
     # Audit
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
+    created_by = Column(Uuid(as_uuid=False), ForeignKey("users.id"), nullable=False)
 
     # Relationships
     member = relationship("Member", back_populates="purchases")
@@ -74,6 +96,20 @@ class Purchase(Base, UUIDMixin, TimestampMixin):
         """Check if this purchase has expired."""
         return date.today() > self.expiry_date
 
+    @is_expired.expression
+    def is_expired(cls):
+        """SQL expression so expiry filters run in the database."""
+        return cls.expiry_date < func.current_date()
+
+    def is_expired_on(self, today: date) -> bool:
+        """
+        Check expiry against a caller-supplied date.
+
+        Avoids a date.today() call per purchase when rendering long
+        purchase histories; callers fetch today once and pass it in.
+        """
+        return today > self.expiry_date
+
     def calculate_expiry_dates(self):
         """
         Calculate expiry_date and rollover_deadline from purchase_date.
@@ -1,15 +1,19 @@
 """
 GamingSession model for activity tracking.
 """
-from sqlalchemy import Column, String, DECIMAL, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DECIMAL, Date, DateTime, ForeignKey, Uuid, Index, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 # UUID import removed for SQLite compatibility
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 import enum
 
 from ..database import Base
 from .base import UUIDMixin, TimestampMixin
 
+# Hoisted so calculate_hours_consumed doesn't rebuild them per call
+_SECONDS_PER_HOUR = Decimal(3600)
+_HOURS_QUANTUM = Decimal("0.01")
+
 
 class SessionStatus(str, enum.Enum):
     """Status of gaming session."""
@@ -28,13 +32,53 @@ class GamingSession(Base, UUIDMixin, TimestampMixin):
     - On void: refund hours_consumed back to member
     """
     __tablename__ = "gaming_sessions"
+    __table_args__ = (
+        # The session-start check ("does this member have an active session?")
+        # filters on member_id AND status; a composite index serves it with a
+        # single narrow scan instead of combining two single-column indexes.
+        Index("ix_gaming_sessions_member_status", "member_id", "status"),
+        # Partial index over just the active rows - a tiny fraction of
+        # history, so the planner's scan for the active-session predicate
+        # touches almost nothing. (Enum columns store the member NAME.)
+        Index(
+            "ix_gaming_sessions_active",
+            "member_id",
+            postgresql_where=text("status = 'ACTIVE'"),
+            sqlite_where=text("status = 'ACTIVE'")
+        ),
+        # The monitoring list selects open sessions (time_end IS NULL)
+        # ordered by start time; a partial index over just those rows
+        # serves both the filter and the sort and stays tiny no matter
+        # how much history accumulates.
+        Index(
+            "ix_gaming_sessions_open_start",
+            "time_start",
+            postgresql_where=text("time_end IS NULL"),
+            sqlite_where=text("time_end IS NULL")
+        ),
+        # Per-member session history pages ORDER BY time DESC with a
+        # member_id filter; the composite lets the planner walk the
+        # index in order and stop at the page limit, no sort step.
+        Index("ix_gaming_sessions_member_time", "member_id", "time_start"),
+        # DB-enforced invariant: at most one open session per member.
+        # The application-level check-then-insert in start_session can
+        # race under concurrency; this makes the second insert fail with
+        # an IntegrityError no matter how requests interleave.
+        Index(
+            "uq_gaming_sessions_one_active",
+            "member_id",
+            unique=True,
+            postgresql_where=text("time_end IS NULL"),
+            sqlite_where=text("time_end IS NULL")
+        ),
+    )
 
     # Member linkage
-    member_id = Column(String(36), ForeignKey("members.id", ondelete="CASCADE"), nullable=False, index=True)
+    member_id = Column(Uuid(as_uuid=False), ForeignKey("members.id", ondelete="CASCADE"), nullable=False, index=True)
     mobile = Column(String(10), nullable=False)  # Denormalized
 
     # Location
-    branch_id = Column(String(36), ForeignKey("branches.id"), nullable=False, index=True)
+    branch_id = Column(Uuid(as_uuid=False), ForeignKey("branches.id"), nullable=False, index=True)
 
     # Time tracking
     date = Column(Date, nullable=False, index=True)
@@ -51,13 +95,18 @@ class GamingSession(Base, UUIDMixin, TimestampMixin):
     status = Column(SQLEnum(SessionStatus), default=SessionStatus.ACTIVE, nullable=False, index=True)
 
     # Audit
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
+    created_by = Column(Uuid(as_uuid=False), ForeignKey("users.id"), nullable=False)
 
     # Relationships
     member = relationship("Member", back_populates="sessions")
     branch = relationship("Branch", back_populates="sessions")
     creator = relationship("User", back_populates="created_sessions", foreign_keys=[created_by])
 
+    @property
+    def is_active(self) -> bool:
+        """True while the session is open (no end time recorded)."""
+        return self.time_end is None
+
     def calculate_hours_consumed(self):
         """
         Calculate hours consumed from time_start to time_end.
@@ -67,9 +116,12 @@ class GamingSession(Base, UUIDMixin, TimestampMixin):
         if not self.time_end:
             return Decimal('0.00')
 
-        duration_seconds = (self.time_end - self.time_start).total_seconds()
-        hours = Decimal(str(duration_seconds / 3600))
-        return round(hours, 2)
+        # Integer-seconds Decimal arithmetic avoids the float -> str ->
+        # Decimal round trip of the previous implementation
+        delta = self.time_end - self.time_start
+        total_seconds = delta.days * 86400 + delta.seconds
+        hours = Decimal(total_seconds) / _SECONDS_PER_HOUR
+        return hours.quantize(_HOURS_QUANTUM, rounding=ROUND_HALF_UP)
 
     def __repr__(self):
         return f"<GamingSession {self.table_number} - {self.game_title} ({self.hours_consumed}h)>"
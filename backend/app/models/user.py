@@ -1,7 +1,7 @@
 """
 User and RefreshToken models for authentication.
 """
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Index, Uuid, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 import uuid
@@ -24,13 +24,19 @@ class User(Base, TimestampMixin):
     Supports role-based access control (RBAC) and OAuth.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Functional unique index so the login lookup can match
+        # case-insensitively straight off the index, and so
+        # Foo@example.com can't register alongside foo@example.com.
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+    )
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
     role = Column(SQLEnum(UserRole), default=UserRole.STAFF, nullable=False, index=True)
-    branch_id = Column(String(36), ForeignKey("branches.id"), nullable=True, index=True)
+    branch_id = Column(Uuid(as_uuid=False), ForeignKey("branches.id"), nullable=True, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     oauth_provider = Column(String, nullable=True)  # "google" or None
@@ -53,8 +59,8 @@ class RefreshToken(Base):
     """
     __tablename__ = "refresh_tokens"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    user_id = Column(Uuid(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     token = Column(String, unique=True, index=True, nullable=False)
     expires_at = Column(DateTime, nullable=False, index=True)
     revoked = Column(Boolean, default=False, nullable=False)
@@ -1,11 +1,16 @@
 """
 Authentication endpoints for UNTANGLE.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import threading
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..schemas.auth import (
     UserRegister,
     TokenResponse,
@@ -15,6 +20,7 @@ from ..schemas.auth import (
     GoogleOAuthCallback
 )
 from ..services import auth_service
+from ..dependencies import require_role
 from ..auth.jwt import verify_token
 from ..auth.oauth import exchange_code_for_token, get_google_user_info
 from ..models.user import User
@@ -25,15 +31,52 @@ router = APIRouter()
 # OAuth2 scheme for bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Login rate limiting: at most _LOGIN_RATE_LIMIT attempts per
+# (client IP, account) per minute. Each bcrypt verify costs ~100 ms of
+# CPU, so unthrottled credential stuffing is also a cheap DoS vector.
+_LOGIN_RATE_LIMIT = 10
+_login_attempts: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_login_attempts_lock = threading.Lock()
+
+
+def _check_login_rate_limit(request: Request, email: str) -> None:
+    """
+    Count a login attempt and reject when the per-minute budget is spent.
+
+    Keyed by (client IP, hashed email) so one attacker can't lock out an
+    account from everywhere, and one IP can't spray many accounts.
+
+    Raises:
+        HTTPException: 429 when the attempt budget is exhausted
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    key = (client_ip, hashlib.sha256(email.encode()).hexdigest()[:16])
+
+    with _login_attempts_lock:
+        attempts = _login_attempts.get(key, 0) + 1
+        _login_attempts[key] = attempts
+
+    if attempts > _LOGIN_RATE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Please try again in a minute."
+        )
+
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get current authenticated user from JWT token.
 
+    The resolved user is memoized on request.state so that routes where
+    several dependencies resolve the user only pay for one token check
+    and one database lookup per request.
+
     Args:
+        request: Current request (used to memoize the resolved user)
         token: JWT access token
         db: Database session
 
@@ -43,6 +86,10 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+
     payload = verify_token(token, token_type="access")
 
     if not payload:
@@ -52,27 +99,37 @@ async def get_current_user(
     if not user_id:
         raise UnauthorizedException("Could not validate credentials")
 
-    user = auth_service.get_user_by_id(db, user_id)
-    if not user:
+    # Cheap authorization gate first: the cached snapshot rejects
+    # unknown/deactivated users without loading the full row
+    snapshot = await auth_service.get_user_auth_snapshot(db, user_id)
+    if snapshot is None:
         raise NotFoundException("User", user_id)
 
-    if not user.is_active:
+    _, is_active, _, _ = snapshot
+    if not is_active:
         raise UnauthorizedException("User account is inactive")
 
+    # These endpoints (profile read/update) need the ORM instance itself;
+    # Session.get() reuses the identity map where possible
+    user = await auth_service.get_user_by_id(db, user_id)
+    if not user:
+        raise NotFoundException("User", user_id)
+
+    request.state.user = user
     return user
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
 
     Creates a new user account and returns access/refresh tokens.
     """
-    user = auth_service.create_user(
+    user = await auth_service.create_user(
         db,
         email=user_data.email,
         password=user_data.password,
@@ -80,27 +137,31 @@ async def register(
         role=user_data.role
     )
 
-    tokens = auth_service.create_tokens_for_user(db, user)
+    tokens = await auth_service.create_tokens_for_user(db, user)
 
     return TokenResponse(**tokens)
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login with email and password.
 
-    Returns access and refresh tokens.
+    Returns access and refresh tokens. Attempts are rate-limited per
+    (client IP, account) to 10 per minute.
     """
-    user = auth_service.authenticate_user(db, form_data.username, form_data.password)
+    _check_login_rate_limit(request, form_data.username)
+
+    user = await auth_service.authenticate_user(db, form_data.username, form_data.password)
 
     if not user:
         raise UnauthorizedException("Incorrect email or password")
 
-    tokens = auth_service.create_tokens_for_user(db, user)
+    tokens = await auth_service.create_tokens_for_user(db, user)
 
     return TokenResponse(**tokens)
 
@@ -108,14 +169,14 @@ async def login(
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     token_data: TokenRefresh,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh access token using refresh token.
 
     Returns new access and refresh tokens.
     """
-    tokens = auth_service.refresh_access_token(db, token_data.refresh_token)
+    tokens = await auth_service.refresh_access_token(db, token_data.refresh_token)
 
     return TokenResponse(**tokens)
 
@@ -123,13 +184,13 @@ async def refresh_token(
 @router.post("/logout")
 async def logout(
     token_data: TokenRefresh,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Logout by revoking refresh token.
     """
-    auth_service.revoke_refresh_token(db, token_data.refresh_token)
+    await auth_service.revoke_refresh_token(db, token_data.refresh_token)
 
     return {"success": True, "message": "Logged out successfully"}
 
@@ -148,34 +209,79 @@ async def get_current_user_profile(
 async def update_current_user_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user profile.
+
+    No-op updates (no fields, or values identical to the current ones)
+    return immediately without issuing a COMMIT.
     """
-    if user_update.full_name:
+    changed = False
+
+    if user_update.full_name and user_update.full_name != current_user.full_name:
         current_user.full_name = user_update.full_name
+        changed = True
 
     if user_update.email and user_update.email != current_user.email:
-        # Check if email is already taken
-        existing = auth_service.get_user_by_email(db, user_update.email)
-        if existing:
+        # Boolean EXISTS check - no need to hydrate the conflicting row
+        email_taken = (await db.execute(
+            select(exists().where(User.email == user_update.email))
+        )).scalar()
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already in use"
             )
         current_user.email = user_update.email
+        changed = True
 
-    db.commit()
-    db.refresh(current_user)
+    if not changed:
+        return UserResponse.from_orm(current_user)
 
-    return UserResponse.from_orm(current_user)
+    # Flush runs the UPDATE (including the Python-side updated_at
+    # onupdate), so the response can be built before commit expires the
+    # instance - this replaces the old commit + refresh re-SELECT
+    await db.flush()
+    response = UserResponse.from_orm(current_user)
+    await db.commit()
+
+    # Name/email changed; drop the cached auth snapshot
+    auth_service.invalidate_user_snapshot(current_user.id)
+
+    return response
+
+
+@router.post("/batch/purge-expired-tokens", status_code=status.HTTP_200_OK)
+async def batch_purge_expired_tokens(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """
+    Batch job: Delete refresh tokens past their expiry date.
+
+    This endpoint should be called by a scheduled task (cron job) daily.
+    Expired tokens can never authenticate again; purging them keeps the
+    refresh-token table (and the lookup on the refresh path) small.
+
+    Only admin role can trigger this batch job.
+
+    Returns:
+        Number of tokens deleted
+    """
+    count = await auth_service.purge_expired_refresh_tokens(db)
+
+    return {
+        "success": True,
+        "message": f"Purged {count} expired refresh token(s)",
+        "count": count
+    }
 
 
 @router.post("/google/callback", response_model=TokenResponse)
 async def google_oauth_callback(
     callback_data: GoogleOAuthCallback,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Handle Google OAuth callback.
@@ -192,7 +298,7 @@ async def google_oauth_callback(
     user_info = await get_google_user_info(token_response["access_token"])
 
     # Create or update user
-    user = auth_service.create_or_update_oauth_user(
+    user = await auth_service.create_or_update_oauth_user(
         db,
         email=user_info["email"],
         full_name=user_info.get("name", ""),
@@ -200,6 +306,6 @@ async def google_oauth_callback(
     )
 
     # Create tokens
-    tokens = auth_service.create_tokens_for_user(db, user)
+    tokens = await auth_service.create_tokens_for_user(db, user)
 
     return TokenResponse(**tokens)
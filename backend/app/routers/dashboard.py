@@ -1,16 +1,20 @@
 """
 Dashboard analytics and reporting endpoints for UNTANGLE.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date, timedelta
+import asyncio
+import gzip
 import io
-import csv
-import json
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
-from ..database import get_db
+from ..database import get_read_db, ReadSessionLocal, AsyncSessionLocal
 from ..schemas.dashboard import (
     DashboardStatsResponse,
     RevenueStatsResponse,
@@ -22,6 +26,9 @@ from ..schemas.dashboard import (
 )
 from ..services import dashboard_service
 from ..dependencies import get_current_user, require_role
+from ..models.member import Member
+from ..models.purchase import Purchase
+from ..models.session import GamingSession
 from ..models.user import User
 
 router = APIRouter()
@@ -30,7 +37,7 @@ router = APIRouter()
 @router.get("/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -52,7 +59,7 @@ async def get_dashboard_stats(
 @router.get("/revenue", response_model=RevenueStatsResponse)
 async def get_revenue_stats(
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -74,7 +81,7 @@ async def get_revenue_stats(
 async def get_expiring_members(
     days: int = Query(30, ge=1, le=180, description="Days to look ahead"),
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -103,7 +110,7 @@ async def get_top_members(
     limit: int = Query(10, ge=1, le=50, description="Number of top members"),
     by: str = Query("usage", pattern="^(usage|spending)$", description="Sort by usage or spending"),
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -129,7 +136,7 @@ async def get_revenue_chart(
     start_date: Optional[date] = Query(None, description="Start date (defaults to 30 days ago)"),
     end_date: Optional[date] = Query(None, description="End date (defaults to today)"),
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -160,11 +167,33 @@ async def get_revenue_chart(
     return RevenueChartResponse(**data)
 
 
+def _gzip_stream(chunks, level: int = 3):
+    """
+    Compress a byte-chunk generator with streaming gzip.
+
+    CSV text is highly redundant (5-10x typical shrink); level 3 keeps
+    the CPU cost modest for multi-year exports. Compressed bytes are
+    yielded as the underlying chunks arrive, so the download still
+    starts before the queries finish.
+    """
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=level) as gz:
+        for chunk in chunks:
+            gz.write(chunk)
+            if buf.tell():
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+    # Closing the GzipFile flushed the final block + trailer into buf
+    if buf.tell():
+        yield buf.getvalue()
+
+
 @router.get("/export/csv")
 async def export_data_csv(
+    request: Request,
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "manager"]))
 ):
     """
@@ -177,83 +206,167 @@ async def export_data_csv(
 
     Only admin and manager roles can export data.
 
-    Returns CSV file for download.
+    Returns CSV file for download, streamed batch by batch from a
+    server-side cursor so memory stays flat regardless of row count.
     """
-    from ..models.member import Member
-    from ..models.purchase import Purchase
-    from ..models.gaming_session import GamingSession
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Export Members
-    writer.writerow(["=== MEMBERS ==="])
-    writer.writerow(["ID", "Full Name", "Mobile", "Email", "Total Hours Granted", "Total Hours Used", "Balance Hours", "Expiry Date"])
-
-    members = db.query(Member).all()
-    for m in members:
-        writer.writerow([
-            m.id, m.full_name, m.mobile, m.email or "",
-            str(m.total_hours_granted), str(m.total_hours_used),
-            str(m.balance_hours), str(m.expiry_date) if m.expiry_date else ""
-        ])
-
-    writer.writerow([])  # Empty row
-
-    # Export Purchases
-    writer.writerow(["=== PURCHASES ==="])
-    writer.writerow(["ID", "Member ID", "Purchase Date", "Hours Purchased", "Amount Paid", "Payment Method", "Expiry Date", "Rollover Status"])
-
-    purchase_query = db.query(Purchase)
-    if start_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date >= start_date)
-    if end_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date <= end_date)
-
-    purchases = purchase_query.all()
-    for p in purchases:
-        writer.writerow([
-            p.id, p.member_id, str(p.purchase_date), str(p.hours_purchased),
-            str(p.amount_paid), p.payment_method, str(p.expiry_date), p.rollover_status
-        ])
-
-    writer.writerow([])  # Empty row
+    _BATCH = 10_000
+
+    def arrow_section(result, header, build_table):
+        """
+        Yield one section of the CSV from Arrow batches.
+
+        Rows are fetched in batches and written by pyarrow's vectorized
+        CSV writer (C++, direct number/date-to-string paths) instead of
+        a per-row Python csv.writer loop. Memory stays O(batch).
+        """
+        wrote_header = False
+        while True:
+            rows = result.fetchmany(_BATCH)
+            if not rows:
+                break
+            sink = pa.BufferOutputStream()
+            pa_csv.write_csv(
+                build_table(rows), sink,
+                write_options=pa_csv.WriteOptions(include_header=not wrote_header)
+            )
+            wrote_header = True
+            yield sink.getvalue().to_pybytes()
+        if not wrote_header:
+            # Empty section: still emit the column header line
+            yield ('"' + '","'.join(header) + '"\n').encode()
+
+    def member_table(rows):
+        ids, names, mobiles, emails, granted, used, balance, expiry = zip(*rows)
+        return pa.table({
+            "ID": pa.array(ids),
+            "Full Name": pa.array(names),
+            "Mobile": pa.array(mobiles),
+            "Email": pa.array(emails),
+            "Total Hours Granted": pa.array(granted),
+            "Total Hours Used": pa.array(used),
+            "Balance Hours": pa.array(balance),
+            "Expiry Date": pa.array(expiry)
+        })
+
+    def purchase_table(rows):
+        ids, member_ids, dates, hours, amounts, plans, expiries, statuses = zip(*rows)
+        return pa.table({
+            "ID": pa.array(ids),
+            "Member ID": pa.array(member_ids),
+            "Purchase Date": pa.array(dates),
+            "Hours Granted": pa.array(hours),
+            "Amount Paid": pa.array(amounts),
+            "Plan Name": pa.array(plans),
+            "Expiry Date": pa.array(expiries),
+            "Rollover Status": pa.array([s.value for s in statuses])
+        })
+
+    def session_table(rows):
+        ids, member_ids, starts, ends, hours, tables = zip(*rows)
+        return pa.table({
+            "ID": pa.array(ids),
+            "Member ID": pa.array(member_ids),
+            "Start Time": pa.array(starts),
+            # Preserve the old "Active" marker for open sessions
+            "End Time": pa.array([str(e) if e else "Active" for e in ends]),
+            "Hours Consumed": pa.array(hours),
+            "Table Number": pa.array(tables)
+        })
+
+    # stream_results switches the driver to a server-side cursor on
+    # PostgreSQL, so rows flow to the client as each batch is written
+    # instead of the full result set being buffered up front
+    _stream_opts = {"yield_per": _BATCH, "stream_results": True}
+
+    def gen():
+        """
+        Yield CSV chunks section by section.
+
+        Owns its database session: the streamed response outlives the
+        request handler, so a Depends(get_db) session must not be relied
+        on to stay open for the whole iteration.
+        """
+        db = ReadSessionLocal()
+        try:
+            yield b"=== MEMBERS ===\n"
+            member_result = db.execute(
+                select(
+                    Member.id, Member.full_name, Member.mobile, Member.email,
+                    Member.total_hours_granted, Member.total_hours_used,
+                    Member.balance_hours, Member.expiry_date
+                ).execution_options(**_stream_opts)
+            )
+            yield from arrow_section(
+                member_result,
+                ["ID", "Full Name", "Mobile", "Email", "Total Hours Granted", "Total Hours Used", "Balance Hours", "Expiry Date"],
+                member_table
+            )
+
+            yield b"\n=== PURCHASES ===\n"
+            purchase_stmt = select(
+                Purchase.id, Purchase.member_id, Purchase.purchase_date,
+                Purchase.hours_granted, Purchase.amount_paid, Purchase.plan_name,
+                Purchase.expiry_date, Purchase.rollover_status
+            )
+            if start_date:
+                purchase_stmt = purchase_stmt.where(Purchase.purchase_date >= start_date)
+            if end_date:
+                purchase_stmt = purchase_stmt.where(Purchase.purchase_date <= end_date)
+            yield from arrow_section(
+                db.execute(purchase_stmt.execution_options(**_stream_opts)),
+                ["ID", "Member ID", "Purchase Date", "Hours Granted", "Amount Paid", "Plan Name", "Expiry Date", "Rollover Status"],
+                purchase_table
+            )
+
+            yield b"\n=== GAMING SESSIONS ===\n"
+            session_stmt = select(
+                GamingSession.id, GamingSession.member_id, GamingSession.time_start,
+                GamingSession.time_end, GamingSession.hours_consumed,
+                GamingSession.table_number
+            )
+            if start_date:
+                session_stmt = session_stmt.where(GamingSession.date >= start_date)
+            if end_date:
+                session_stmt = session_stmt.where(GamingSession.date <= end_date)
+            yield from arrow_section(
+                db.execute(session_stmt.execution_options(**_stream_opts)),
+                ["ID", "Member ID", "Start Time", "End Time", "Hours Consumed", "Table Number"],
+                session_table
+            )
+        finally:
+            db.close()
+
+    headers = {
+        "Content-Disposition": f"attachment; filename=untangle_export_{date.today()}.csv"
+    }
 
-    # Export Sessions
-    writer.writerow(["=== GAMING SESSIONS ==="])
-    writer.writerow(["ID", "Member ID", "Start Time", "End Time", "Hours Used", "Station ID"])
+    # Streamed responses bypass GZipMiddleware's buffering heuristics;
+    # compress here when the client negotiates it
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        return StreamingResponse(_gzip_stream(gen()), media_type="text/csv", headers=headers)
 
-    session_query = db.query(GamingSession)
-    if start_date:
-        session_query = session_query.filter(GamingSession.start_time >= start_date)
-    if end_date:
-        session_query = session_query.filter(GamingSession.start_time <= end_date)
+    return StreamingResponse(gen(), media_type="text/csv", headers=headers)
 
-    sessions = session_query.all()
-    for s in sessions:
-        writer.writerow([
-            s.id, s.member_id, str(s.start_time),
-            str(s.end_time) if s.end_time else "Active",
-            str(s.hours_used) if s.hours_used else "0",
-            s.station_id or ""
-        ])
 
-    output.seek(0)
+async def _fetch_mappings(stmt):
+    """
+    Run one export query on its own AsyncSession.
 
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=untangle_export_{date.today()}.csv"
-        }
-    )
+    Each concurrent query gets a dedicated session (and thus its own
+    pooled connection) for just as long as the query runs, so gathering
+    them doesn't hold a shared connection across the whole request.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        return result.mappings().all()
 
 
 @router.get("/export/json")
 async def export_data_json(
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "manager"]))
 ):
     """
@@ -269,26 +382,41 @@ async def export_data_json(
 
     Returns JSON file for download.
     """
-    from ..models.member import Member
-    from ..models.purchase import Purchase
-    from ..models.gaming_session import GamingSession
-
-    # Get data
-    members = db.query(Member).all()
+    # Core column selects + RowMapping access: no ORM identity map, no
+    # instrumented attributes, no lazy-load risk - just the columns below
+    member_stmt = select(
+        Member.id, Member.full_name, Member.mobile, Member.email,
+        Member.total_hours_granted, Member.total_hours_used,
+        Member.balance_hours, Member.expiry_date
+    )
 
-    purchase_query = db.query(Purchase)
+    purchase_stmt = select(
+        Purchase.id, Purchase.member_id, Purchase.purchase_date,
+        Purchase.hours_granted, Purchase.amount_paid, Purchase.plan_name,
+        Purchase.rollover_status
+    )
     if start_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date >= start_date)
+        purchase_stmt = purchase_stmt.where(Purchase.purchase_date >= start_date)
     if end_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date <= end_date)
-    purchases = purchase_query.all()
+        purchase_stmt = purchase_stmt.where(Purchase.purchase_date <= end_date)
 
-    session_query = db.query(GamingSession)
+    session_stmt = select(
+        GamingSession.id, GamingSession.member_id, GamingSession.time_start,
+        GamingSession.time_end, GamingSession.hours_consumed,
+        GamingSession.table_number
+    )
     if start_date:
-        session_query = session_query.filter(GamingSession.start_time >= start_date)
+        session_stmt = session_stmt.where(GamingSession.date >= start_date)
     if end_date:
-        session_query = session_query.filter(GamingSession.start_time <= end_date)
-    sessions = session_query.all()
+        session_stmt = session_stmt.where(GamingSession.date <= end_date)
+
+    # The three queries are independent; run them concurrently so the
+    # endpoint waits for the slowest one instead of their sum
+    members, purchases, sessions = await asyncio.gather(
+        _fetch_mappings(member_stmt),
+        _fetch_mappings(purchase_stmt),
+        _fetch_mappings(session_stmt)
+    )
 
     # Build JSON structure
     data = {
@@ -297,42 +425,9 @@ async def export_data_json(
             "start": start_date.isoformat() if start_date else None,
             "end": end_date.isoformat() if end_date else None
         },
-        "members": [
-            {
-                "id": m.id,
-                "full_name": m.full_name,
-                "mobile": m.mobile,
-                "email": m.email,
-                "total_hours_granted": float(m.total_hours_granted),
-                "total_hours_used": float(m.total_hours_used),
-                "balance_hours": float(m.balance_hours),
-                "expiry_date": m.expiry_date.isoformat() if m.expiry_date else None
-            }
-            for m in members
-        ],
-        "purchases": [
-            {
-                "id": p.id,
-                "member_id": p.member_id,
-                "purchase_date": p.purchase_date.isoformat(),
-                "hours_purchased": float(p.hours_purchased),
-                "amount_paid": float(p.amount_paid),
-                "payment_method": p.payment_method,
-                "rollover_status": p.rollover_status
-            }
-            for p in purchases
-        ],
-        "sessions": [
-            {
-                "id": s.id,
-                "member_id": s.member_id,
-                "start_time": s.start_time.isoformat(),
-                "end_time": s.end_time.isoformat() if s.end_time else None,
-                "hours_used": float(s.hours_used) if s.hours_used else 0,
-                "station_id": s.station_id
-            }
-            for s in sessions
-        ],
+        "members": [dict(m) for m in members],
+        "purchases": [dict(p) for p in purchases],
+        "sessions": [dict(s) for s in sessions],
         "summary": {
             "total_members": len(members),
             "total_purchases": len(purchases),
@@ -340,10 +435,12 @@ async def export_data_json(
         }
     }
 
-    json_str = json.dumps(data, indent=2)
+    # orjson serializes dates/datetimes natively in C; default=str covers
+    # the Decimal columns (serialized at full precision, no float hop)
+    payload = orjson.dumps(data, default=str)
 
     return StreamingResponse(
-        iter([json_str]),
+        iter([payload]),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename=untangle_export_{date.today()}.json"
@@ -2,9 +2,11 @@
 Member management endpoints for UNTANGLE.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-import math
+from datetime import date
+import orjson
 
 from ..database import get_db
 from ..schemas.members import (
@@ -21,6 +23,30 @@ from ..exceptions import NotFoundException, ConflictException
 router = APIRouter()
 
 
+def _member_list_item(member, today: date) -> MemberResponse:
+    """
+    Build a MemberResponse from a trusted DB row without validation.
+
+    List pages construct up to 100 of these per request; model_construct
+    skips the per-field validation pass that from_orm runs, since the
+    values come straight from our own columns.
+    """
+    return MemberResponse.model_construct(
+        id=member.id,
+        full_name=member.full_name,
+        mobile=member.mobile,
+        email=member.email,
+        branch_id=member.branch_preferred_id,
+        total_hours_granted=member.total_hours_granted,
+        total_hours_used=member.total_hours_used,
+        balance_hours=member.balance_hours,
+        expiry_date=member.expiry_date,
+        is_expired=member.is_expired_on(today),
+        created_at=member.created_at,
+        updated_at=member.updated_at,
+    )
+
+
 @router.post("/", response_model=MemberResponse, status_code=status.HTTP_201_CREATED)
 async def create_member(
     member_data: MemberCreate,
@@ -48,8 +74,10 @@ async def list_members(
     search: Optional[str] = Query(None, description="Search by name or mobile"),
     branch_id: Optional[str] = Query(None, description="Filter by branch"),
     is_expired: Optional[bool] = Query(None, description="Filter by expiry status"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset mode)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response"),
+    use_cursor: bool = Query(False, description="Use keyset pagination (no totals, next_cursor instead)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -60,30 +88,88 @@ async def list_members(
     - Search by name or mobile number
     - Filter by branch
     - Filter by expiry status
-    - Pagination
+    - Offset pagination (page/page_size) or keyset pagination
+      (use_cursor=true, then follow next_cursor) - keyset pages skip
+      the per-page COUNT and stay fast at any depth
 
     Requires authentication.
     """
-    members, total = members_service.search_members(
+    members, total, next_cursor = members_service.search_members(
         db,
         search=search,
         branch_id=branch_id,
         is_expired=is_expired,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor
     )
 
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    total_pages = None
+    if total is not None:
+        # Ceil division in integers: (0 + n - 1) // n == 0, so no
+        # zero-total branch is needed
+        total_pages = (total + page_size - 1) // page_size
+
+    today = date.today()
 
     return MemberListResponse(
-        members=[MemberResponse.from_orm(m) for m in members],
+        members=[_member_list_item(m, today) for m in members],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
+def _iter_members_json(db: Session):
+    """
+    Yield all members as a streamed JSON array.
+
+    Each row is orjson-encoded as soon as the database yields it, so peak
+    memory stays O(1) regardless of member count and the first byte ships
+    before the query finishes.
+    """
+    today = date.today()
+    yield b"["
+    first = True
+    for member in members_service.iter_members(db):
+        if not first:
+            yield b","
+        first = False
+        yield orjson.dumps({
+            "id": member.id,
+            "full_name": member.full_name,
+            "mobile": member.mobile,
+            "email": member.email,
+            "current_plan": member.current_plan,
+            "total_hours_granted": member.total_hours_granted,
+            "total_hours_used": member.total_hours_used,
+            "balance_hours": member.balance_hours,
+            "expiry_date": member.expiry_date,
+            "is_expired": member.is_expired_on(today),
+            "registration_date": member.registration_date
+        }, default=str)
+    yield b"]"
+
+
+@router.get("/stream")
+async def stream_members(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream all members as a JSON array.
+
+    Unlike the paginated list endpoint, this never buffers the full
+    result set - intended for exports and report tooling on large hubs.
+
+    Requires authentication.
+    """
+    return StreamingResponse(_iter_members_json(db), media_type="application/json")
+
+
 @router.get("/mobile/{mobile}", response_model=MemberResponse)
 async def get_member_by_mobile(
     mobile: str,
@@ -138,8 +224,7 @@ async def update_member(
     - Full name
     - Mobile number (will check for conflicts)
     - Email
-    - Branch assignment
-    - Notes
+    - Preferred branch assignment
 
     Requires authentication.
     """
@@ -149,8 +234,7 @@ async def update_member(
         full_name=member_update.full_name,
         mobile=member_update.mobile,
         email=member_update.email,
-        branch_id=member_update.branch_id,
-        notes=member_update.notes
+        branch_id=member_update.branch_id
     )
 
     return MemberResponse.from_orm(member)
@@ -3,9 +3,9 @@ Purchase/Credits management endpoints for UNTANGLE.
 Contains critical 180-day rollover business logic.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 from typing import Optional
-import math
 from decimal import Decimal
 
 from ..database import get_db
@@ -14,17 +14,44 @@ from ..schemas.purchases import (
     PurchaseResponse,
     PurchaseListResponse,
     PurchaseHistoryResponse,
+    PurchaseBulkImportRequest,
     RolloverRequest,
     RolloverResponse
 )
 from ..services import purchases_service, members_service
 from ..dependencies import get_current_user, require_role
+from ..models.member import Member
+from ..models.purchase import Purchase
 from ..models.user import User
 from ..exceptions import NotFoundException
 
 router = APIRouter()
 
 
+def _purchase_list_item(purchase: Purchase) -> PurchaseResponse:
+    """
+    Build a PurchaseResponse from a trusted DB row without validation.
+
+    List pages construct up to 100 of these per request; model_construct
+    skips the per-field validation pass that from_orm runs, since the
+    values come straight from our own columns.
+    """
+    return PurchaseResponse.model_construct(
+        id=purchase.id,
+        member_id=purchase.member_id,
+        plan_name=purchase.plan_name,
+        purchase_date=purchase.purchase_date,
+        hours_purchased=purchase.hours_granted,
+        total_valid_purchased=purchase.total_valid_purchased,
+        amount_paid=purchase.amount_paid,
+        expiry_date=purchase.expiry_date,
+        rollover_deadline=purchase.rollover_deadline,
+        rollover_status=purchase.rollover_status.value,
+        created_at=purchase.created_at,
+        updated_at=purchase.updated_at,
+    )
+
+
 @router.post("/", response_model=PurchaseResponse, status_code=status.HTTP_201_CREATED)
 async def create_purchase(
     purchase_data: PurchaseCreate,
@@ -52,8 +79,8 @@ async def create_purchase(
         member_id=purchase_data.member_id,
         hours_purchased=purchase_data.hours_purchased,
         amount_paid=purchase_data.amount_paid,
-        payment_method=purchase_data.payment_method,
-        payment_reference=purchase_data.payment_reference,
+        created_by=current_user.id,
+        plan_name=purchase_data.plan_name,
         purchase_date=purchase_data.purchase_date
     )
 
@@ -64,8 +91,10 @@ async def create_purchase(
 async def list_purchases(
     member_id: Optional[str] = Query(None, description="Filter by member"),
     rollover_status: Optional[str] = Query(None, description="Filter by rollover status"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset mode)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response"),
+    use_cursor: bool = Query(False, description="Use keyset pagination (no totals, next_cursor instead)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -75,26 +104,35 @@ async def list_purchases(
     Supports:
     - Filter by member
     - Filter by rollover status (pending/completed/expired)
-    - Pagination
+    - Offset pagination (page/page_size) or keyset pagination
+      (use_cursor=true, then follow next_cursor) - keyset pages skip
+      the per-page COUNT and stay fast at any depth
 
     Requires authentication.
     """
-    purchases, total = purchases_service.list_purchases(
+    purchases, total, next_cursor = purchases_service.list_purchases(
         db,
         member_id=member_id,
         rollover_status=rollover_status,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor
     )
 
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    total_pages = None
+    if total is not None:
+        # Ceil division in integers: (0 + n - 1) // n == 0, so no
+        # zero-total branch is needed
+        total_pages = (total + page_size - 1) // page_size
 
     return PurchaseListResponse(
-        purchases=[PurchaseResponse.from_orm(p) for p in purchases],
+        purchases=[_purchase_list_item(p) for p in purchases],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
@@ -116,24 +154,36 @@ async def get_member_purchase_history(
 
     Requires authentication.
     """
-    # Validate member exists
-    member = members_service.get_member_by_id(db, member_id)
-    if not member:
+    # Only the two summary scalars are needed from the member - a narrow
+    # column select skips hydrating the full instance (which would also
+    # eager-load the member's purchases and sessions) and doubles as the
+    # existence check
+    member_row = db.execute(
+        select(Member.id, Member.total_hours_granted, Member.balance_hours)
+        .where(Member.id == member_id)
+    ).one_or_none()
+    if member_row is None:
         raise NotFoundException("Member", member_id)
 
-    # Get all purchases (no pagination for history summary)
-    purchases, total = purchases_service.get_member_purchases(db, member_id, page=1, page_size=1000)
+    # Summary aggregates run DB-side in one pass, instead of pulling
+    # every purchase row into Python just to sum amount_paid
+    total_amount_paid, total = db.execute(
+        select(
+            func.coalesce(func.sum(Purchase.amount_paid), 0),
+            func.count()
+        ).where(Purchase.member_id == member_id)
+    ).one()
 
-    # Calculate summary
-    total_amount_paid = sum(p.amount_paid for p in purchases)
+    # Only the most recent page of rows is actually returned
+    purchases, _ = purchases_service.get_member_purchases(db, member_id, page=1, page_size=50)
 
     return PurchaseHistoryResponse(
         member_id=member_id,
-        purchases=[PurchaseResponse.from_orm(p) for p in purchases],
+        purchases=[_purchase_list_item(p) for p in purchases],
         total_purchases=total,
-        total_hours_granted=member.total_hours_granted,
+        total_hours_granted=member_row.total_hours_granted,
         total_amount_paid=total_amount_paid,
-        active_balance=member.balance_hours
+        active_balance=member_row.balance_hours
     )
 
 
@@ -191,7 +241,7 @@ async def apply_rollover(
     Use force=true for admin override (bypasses validation).
     """
     try:
-        purchase = purchases_service.apply_rollover(
+        purchase, rollover_hours = purchases_service.apply_rollover(
             db,
             purchase_id=purchase_id,
             force=rollover_request.force
@@ -200,9 +250,9 @@ async def apply_rollover(
         return RolloverResponse(
             success=True,
             purchase_id=purchase.id,
-            rollover_hours=purchase.rollover_hours or Decimal("0.0"),
-            rollover_status=purchase.rollover_status,
-            message=f"Rollover applied successfully. {purchase.rollover_hours} hours added to member's balance."
+            rollover_hours=rollover_hours,
+            rollover_status=purchase.rollover_status.value,
+            message=f"Rollover applied successfully. {rollover_hours} hours added to member's balance."
         )
 
     except Exception as e:
@@ -215,6 +265,40 @@ async def apply_rollover(
         )
 
 
+@router.post("/batch/import", status_code=status.HTTP_201_CREATED)
+async def batch_import_purchases(
+    import_request: PurchaseBulkImportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["admin", "manager"]))
+):
+    """
+    Bulk-import purchases in a single transaction.
+
+    Intended for migrations and payment-batch reconciliation: all rows
+    are inserted with one statement and member balances/expiry dates are
+    updated with one grouped statement, instead of a commit per row.
+
+    Rollovers are NOT evaluated for imported purchases - use the
+    per-purchase rollover endpoint for that workflow.
+
+    Only admin and manager roles can import.
+
+    Returns:
+        Number of purchases created
+    """
+    count = purchases_service.create_purchases_bulk(
+        db,
+        purchases=[p.model_dump() for p in import_request.purchases],
+        created_by=current_user.id
+    )
+
+    return {
+        "success": True,
+        "message": f"Imported {count} purchase(s)",
+        "count": count
+    }
+
+
 @router.post("/batch/expire-rollovers", status_code=status.HTTP_200_OK)
 async def batch_expire_rollovers(
     db: Session = Depends(get_db),
@@ -3,31 +3,64 @@ Gaming session endpoints for UNTANGLE.
 Tracks hour usage and automatically deducts from member balance.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-import math
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_async_db
 from ..schemas.sessions import (
     SessionStart,
     SessionEnd,
     SessionResponse,
     SessionListResponse,
-    SessionStatsResponse
+    SessionStatsResponse,
+    ActiveSessionResponse
 )
-from ..services import sessions_service, members_service
+from ..services import sessions_service
 from ..dependencies import get_current_user, require_role
+from ..models.member import Member
 from ..models.user import User
 from ..exceptions import NotFoundException
 
 router = APIRouter()
 
+# Batch list validation runs the whole page through pydantic-core in one
+# call instead of a Python-level from_orm per row; built once at import
+_SESSION_LIST_ADAPTER: TypeAdapter = TypeAdapter(list[SessionResponse])
+
+
+async def _attach_member_names(
+    db: AsyncSession,
+    responses: list[SessionResponse]
+) -> list[SessionResponse]:
+    """
+    Resolve member_name for a page of sessions with one IN-list query.
+
+    The UI renders member names next to every session row; fetching them
+    per row would issue up to page_size SELECTs. Instead: collect the
+    unique member ids from the page, select (id, full_name) for all of
+    them at once, and correlate in application code - exactly one extra
+    query regardless of page size.
+    """
+    member_ids = {r.member_id for r in responses}
+    if not member_ids:
+        return responses
+
+    names = dict((await db.execute(
+        select(Member.id, Member.full_name).where(Member.id.in_(member_ids))
+    )).all())
+
+    for r in responses:
+        r.member_name = names.get(r.member_id)
+    return responses
+
 
 @router.post("/start", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
 async def start_session(
     session_data: SessionStart,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -43,11 +76,13 @@ async def start_session(
 
     Requires authentication. All roles can start sessions.
     """
-    session = sessions_service.start_session(
+    session = await sessions_service.start_session(
         db,
         member_id=session_data.member_id,
+        created_by=current_user.id,
         station_id=session_data.station_id,
-        notes=session_data.notes
+        game_title=session_data.game_title,
+        guru_assigned=current_user.full_name
     )
 
     return SessionResponse.from_orm(session)
@@ -57,7 +92,7 @@ async def start_session(
 async def end_session(
     session_id: str,
     session_end: SessionEnd,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -82,11 +117,10 @@ async def end_session(
                 detail="Only admin and manager can set manual hours"
             )
 
-    session = sessions_service.end_session(
+    session = await sessions_service.end_session(
         db,
         session_id=session_id,
-        manual_hours=session_end.manual_hours,
-        notes=session_end.notes
+        manual_hours=session_end.manual_hours
     )
 
     return SessionResponse.from_orm(session)
@@ -96,9 +130,11 @@ async def end_session(
 async def list_sessions(
     member_id: Optional[str] = Query(None, description="Filter by member"),
     active_only: bool = Query(False, description="Show only active sessions"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset mode)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response"),
+    use_cursor: bool = Query(False, description="Use keyset pagination (no totals, next_cursor instead)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -107,90 +143,128 @@ async def list_sessions(
     Supports:
     - Filter by member
     - Filter active sessions only
-    - Pagination
+    - Offset pagination (page/page_size) or keyset pagination
+      (use_cursor=true, then follow next_cursor) - keyset pages skip
+      the per-page COUNT and stay fast at any depth
 
     Requires authentication.
     """
-    sessions, total = sessions_service.list_sessions(
+    sessions, total, next_cursor = await sessions_service.list_sessions(
         db,
         member_id=member_id,
         active_only=active_only,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor
     )
 
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    total_pages = None
+    if total is not None:
+        # Ceil division in integers: (0 + n - 1) // n == 0, so no
+        # zero-total branch is needed
+        total_pages = (total + page_size - 1) // page_size
+
+    responses = _SESSION_LIST_ADAPTER.validate_python(sessions, from_attributes=True)
+    await _attach_member_names(db, responses)
 
     return SessionListResponse(
-        sessions=[SessionResponse.from_orm(s) for s in sessions],
+        sessions=responses,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
-@router.get("/active", response_model=list[SessionResponse])
+@router.get("/active", response_model=list[ActiveSessionResponse])
 async def get_active_sessions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all currently active sessions.
+    Get all currently active sessions with member details.
 
-    Returns list of sessions that haven't been ended yet.
-    Useful for real-time monitoring dashboard.
+    Returns sessions that haven't been ended yet, each with the
+    member's name, mobile and live balance - everything the monitoring
+    dashboard renders, so it needs no follow-up member lookups.
+
+    Served from a 30s cache (invalidated on session start/end), since
+    the dashboard polls this with an identical query.
 
     Requires authentication.
     """
-    sessions = sessions_service.get_active_sessions(db)
-
-    return [SessionResponse.from_orm(s) for s in sessions]
+    # The service returns serialized dicts (cacheable); the response
+    # model coerces them on the way out
+    return await sessions_service.get_active_sessions(db)
 
 
 @router.get("/member/{member_id}", response_model=SessionListResponse)
 async def get_member_sessions(
     member_id: str,
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset mode)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response"),
+    use_cursor: bool = Query(False, description="Use keyset pagination (no totals, next_cursor instead)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get session history for a specific member.
 
     Returns all sessions (active and completed) for the member,
-    ordered by start time (most recent first).
+    ordered by start time (most recent first). Supports offset
+    pagination or keyset pagination via cursor/use_cursor.
 
     Requires authentication.
     """
-    # Validate member exists
-    member = members_service.get_member_by_id(db, member_id)
-    if not member:
-        raise NotFoundException("Member", member_id)
-
-    sessions, total = sessions_service.get_member_sessions(
+    # List first, existence-check only on an empty result: the session
+    # query already filters by member_id, so any returned row proves the
+    # member exists (FK) and the up-front member load was a wasted
+    # round-trip in the common case. Only an empty page is ambiguous -
+    # then one cheap EXISTS distinguishes "no such member" (404) from
+    # "member with no sessions" (200, empty list).
+    sessions, total, next_cursor = await sessions_service.get_member_sessions(
         db,
         member_id=member_id,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor
     )
 
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    if not sessions:
+        member_exists = (await db.execute(
+            select(exists().where(Member.id == member_id))
+        )).scalar()
+        if not member_exists:
+            raise NotFoundException("Member", member_id)
+
+    total_pages = None
+    if total is not None:
+        # Ceil division in integers: (0 + n - 1) // n == 0, so no
+        # zero-total branch is needed
+        total_pages = (total + page_size - 1) // page_size
+
+    # One narrow (id, full_name) lookup covers the whole page
+    responses = _SESSION_LIST_ADAPTER.validate_python(sessions, from_attributes=True)
+    await _attach_member_names(db, responses)
 
     return SessionListResponse(
-        sessions=[SessionResponse.from_orm(s) for s in sessions],
+        sessions=responses,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/stats", response_model=SessionStatsResponse)
 async def get_session_stats(
     member_id: Optional[str] = Query(None, description="Filter by member"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -207,7 +281,7 @@ async def get_session_stats(
 
     Requires authentication.
     """
-    stats = sessions_service.get_session_stats(db, member_id=member_id)
+    stats = await sessions_service.get_session_stats(db, member_id=member_id)
 
     return SessionStatsResponse(**stats)
 
@@ -215,7 +289,7 @@ async def get_session_stats(
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -226,11 +300,10 @@ async def get_session(
     - Hours used
     - Member information
     - Station ID
-    - Notes
 
     Requires authentication.
     """
-    session = sessions_service.get_session_by_id(db, session_id)
+    session = await sessions_service.get_session_by_id(db, session_id)
 
     if not session:
         raise NotFoundException("Session", session_id)
@@ -3,7 +3,7 @@ Pydantic schemas for authentication.
 """
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class UserRegister(BaseModel):
@@ -45,11 +45,9 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # datetimes serialize to ISO 8601 by default, so the old
+    # json_encoders override is no longer needed
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
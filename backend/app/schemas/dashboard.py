@@ -29,7 +29,9 @@ class RevenueStatsResponse(BaseModel):
     average_purchase_value: Decimal
     total_purchases: int
     purchases_this_month: int
-    payment_methods: dict  # {"cash": amount, "dodo": amount, "card": amount}
+    # Empty until Purchase grows a payment_method column; the service
+    # has no breakdown to report yet
+    payment_methods: dict = Field(default_factory=dict)
 
 
 class MemberStatusCount(BaseModel):
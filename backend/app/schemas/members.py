@@ -2,9 +2,9 @@
 Pydantic schemas for member management.
 """
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
 
 from ..utils import normalize_mobile
 
@@ -16,8 +16,9 @@ class MemberBase(BaseModel):
     email: Optional[str] = Field(None, max_length=100)
     branch_id: Optional[str] = None
 
-    @validator('mobile')
-    def normalize_mobile_number(cls, v):
+    @field_validator('mobile')
+    @classmethod
+    def normalize_mobile_number(cls, v: str) -> str:
         """Normalize mobile number to 10-digit format."""
         return normalize_mobile(v)
 
@@ -33,10 +34,10 @@ class MemberUpdate(BaseModel):
     mobile: Optional[str] = Field(None, min_length=10, max_length=15)
     email: Optional[str] = Field(None, max_length=100)
     branch_id: Optional[str] = None
-    notes: Optional[str] = None
 
-    @validator('mobile')
-    def normalize_mobile_number(cls, v):
+    @field_validator('mobile')
+    @classmethod
+    def normalize_mobile_number(cls, v: Optional[str]) -> Optional[str]:
         """Normalize mobile number to 10-digit format."""
         if v is not None:
             return normalize_mobile(v)
@@ -44,32 +45,47 @@ class MemberUpdate(BaseModel):
 
 
 class MemberResponse(BaseModel):
-    """Schema for member response."""
+    """
+    Schema for member response.
+
+    branch_id stays the wire name; the validation alias reads it from
+    the model's branch_preferred_id column.
+    """
     id: str
     full_name: str
     mobile: str
     email: Optional[str]
-    branch_id: Optional[str]
+    branch_id: Optional[str] = Field(
+        None, validation_alias=AliasChoices("branch_preferred_id", "branch_id")
+    )
     total_hours_granted: Decimal
     total_hours_used: Decimal
     balance_hours: Decimal
     expiry_date: Optional[date]
     is_expired: bool
-    notes: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    # defer_build=False builds the validator/serializer at import time,
+    # so the first list request doesn't pay the schema-compile cost
+    model_config = ConfigDict(
+        from_attributes=True, defer_build=False, populate_by_name=True
+    )
 
 
 class MemberListResponse(BaseModel):
-    """Schema for paginated member list."""
+    """
+    Schema for paginated member list.
+
+    Offset mode populates total/total_pages; keyset mode leaves them
+    None and sets next_cursor while more pages exist.
+    """
     members: list[MemberResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class MemberSearchParams(BaseModel):
@@ -2,9 +2,9 @@
 Pydantic schemas for purchase/credits management.
 """
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class PurchaseBase(BaseModel):
@@ -12,8 +12,7 @@ class PurchaseBase(BaseModel):
     member_id: str
     hours_purchased: Decimal = Field(..., gt=0, description="Number of hours purchased")
     amount_paid: Decimal = Field(..., ge=0, description="Amount paid in PHP")
-    payment_method: str = Field(default="cash", pattern="^(cash|dodo|card)$")
-    payment_reference: Optional[str] = Field(None, max_length=100)
+    plan_name: Optional[str] = Field(None, max_length=100, description="Plan label (defaults to an hours-based one)")
 
 
 class PurchaseCreate(PurchaseBase):
@@ -22,33 +21,47 @@ class PurchaseCreate(PurchaseBase):
 
 
 class PurchaseResponse(BaseModel):
-    """Schema for purchase response."""
+    """
+    Schema for purchase response.
+
+    hours_purchased keeps its wire name; the validation alias reads it
+    from the model's hours_granted column.
+    """
     id: str
     member_id: str
-    purchase_date: date
-    hours_purchased: Decimal
+    plan_name: str
+    purchase_date: datetime
+    hours_purchased: Decimal = Field(
+        validation_alias=AliasChoices("hours_granted", "hours_purchased")
+    )
+    total_valid_purchased: Decimal
     amount_paid: Decimal
-    payment_method: str
-    payment_reference: Optional[str]
     expiry_date: date
     rollover_deadline: date
     rollover_status: str
-    rollover_hours: Optional[Decimal]
-    rollover_applied_at: Optional[date]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    # defer_build=False builds the validator/serializer at import time,
+    # so the first list request doesn't pay the schema-compile cost
+    model_config = ConfigDict(
+        from_attributes=True, defer_build=False, populate_by_name=True
+    )
 
 
 class PurchaseListResponse(BaseModel):
-    """Schema for paginated purchase list."""
+    """
+    Schema for paginated purchase list.
+
+    Offset mode populates total/total_pages; keyset mode leaves them
+    None and sets next_cursor while more pages exist.
+    """
     purchases: list[PurchaseResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class PurchaseHistoryResponse(BaseModel):
@@ -61,6 +74,20 @@ class PurchaseHistoryResponse(BaseModel):
     active_balance: Decimal
 
 
+class PurchaseBulkItem(BaseModel):
+    """One purchase row in a bulk import."""
+    member_id: str
+    plan_name: str = Field(..., max_length=100)
+    hours_purchased: Decimal = Field(..., gt=0, description="Number of hours purchased")
+    amount_paid: Decimal = Field(..., ge=0, description="Amount paid in PHP")
+    purchase_date: Optional[date] = Field(None, description="Date of purchase (defaults to today)")
+
+
+class PurchaseBulkImportRequest(BaseModel):
+    """Schema for bulk purchase import."""
+    purchases: list[PurchaseBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
 class RolloverRequest(BaseModel):
     """Schema for manual rollover trigger."""
     force: bool = Field(default=False, description="Force rollover even if conditions not met")
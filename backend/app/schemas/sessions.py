@@ -4,14 +4,14 @@ Pydantic schemas for gaming session management.
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class SessionStart(BaseModel):
     """Schema for starting a gaming session."""
     member_id: str
     station_id: Optional[str] = Field(None, max_length=50, description="Gaming station/PC ID")
-    notes: Optional[str] = Field(None, max_length=500, description="Session notes")
+    game_title: Optional[str] = Field(None, max_length=100, description="Game being played")
 
 
 class SessionEnd(BaseModel):
@@ -21,33 +21,58 @@ class SessionEnd(BaseModel):
         gt=0,
         description="Manual hour override (admin only). If not provided, calculated from start/end time."
     )
-    notes: Optional[str] = Field(None, max_length=500, description="Additional notes")
 
 
 class SessionResponse(BaseModel):
-    """Schema for session response."""
+    """
+    Schema for session response.
+
+    The wire names predate the model's column names; validation aliases
+    map the ORM columns (time_start/time_end/hours_consumed/
+    table_number) onto the wire fields, which stay unchanged for
+    clients. is_active is a derived property on the model.
+    """
     id: str
     member_id: str
-    start_time: datetime
-    end_time: Optional[datetime]
-    hours_used: Optional[Decimal]
-    station_id: Optional[str]
-    notes: Optional[str]
+    # Resolved by the list endpoints with a single batched member
+    # lookup; None on endpoints that return a bare session
+    member_name: Optional[str] = None
+    start_time: datetime = Field(
+        validation_alias=AliasChoices("time_start", "start_time")
+    )
+    end_time: Optional[datetime] = Field(
+        None, validation_alias=AliasChoices("time_end", "end_time")
+    )
+    hours_used: Optional[Decimal] = Field(
+        None, validation_alias=AliasChoices("hours_consumed", "hours_used")
+    )
+    station_id: Optional[str] = Field(
+        None, validation_alias=AliasChoices("table_number", "station_id")
+    )
     is_active: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    # defer_build=False builds the validator core at import time, so the
+    # first request doesn't pay for schema construction
+    model_config = ConfigDict(
+        from_attributes=True, defer_build=False, populate_by_name=True
+    )
 
 
 class SessionListResponse(BaseModel):
-    """Schema for paginated session list."""
+    """
+    Schema for paginated session list.
+
+    total/total_pages are populated in offset mode only; keyset pages
+    return next_cursor instead (None once the last page is reached).
+    """
     sessions: list[SessionResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ActiveSessionResponse(BaseModel):
@@ -61,8 +86,7 @@ class ActiveSessionResponse(BaseModel):
     duration_minutes: int
     station_id: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SessionStatsResponse(BaseModel):
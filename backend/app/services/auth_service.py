@@ -1,15 +1,24 @@
 """
 Authentication service with business logic.
+
+All functions are async and run on the AsyncSession stack, so auth SQL
+awaits instead of blocking the event loop.
 """
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+import hashlib
+import threading
+
+from cachetools import TTLCache
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from ..cache import get_redis_client
 from ..models.user import User, RefreshToken
 from ..auth.jwt import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token
@@ -17,38 +26,171 @@ from ..auth.jwt import (
 from ..exceptions import UnauthorizedException, ConflictException, NotFoundException
 from ..config import settings
 
+# Short-lived snapshot of the authorization-relevant user columns.
+# Role/active changes are rare, so a 10 s TTL lets hot authenticated
+# traffic authorize from process memory instead of a SELECT per request.
+_auth_snapshot_cache: TTLCache = TTLCache(maxsize=10_000, ttl=10)
+_auth_snapshot_lock = threading.Lock()
+
+# L1 email -> user id mapping. Caching whole ORM instances across
+# sessions would hand detached (and possibly stale) objects to mutation
+# paths, so only the immutable-ish id is cached: a hit turns the email
+# scan into a primary-key get, which reuses the session identity map.
+_email_id_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_email_id_lock = threading.Lock()
+
+# Refresh-token revocation denylist. Keys are short blake2b digests so
+# no raw token material is stored. With Redis configured the denylist is
+# shared across workers and authoritative, letting the hot refresh path
+# skip the per-request RefreshToken row lookup; the process-local
+# fallback only short-circuits known-revoked tokens, and the DB remains
+# authoritative for everything else.
+_REVOKED_TOKEN_PREFIX = "v1:auth:revoked:"
+_revoked_tokens_local: TTLCache = TTLCache(maxsize=100_000, ttl=7 * 86400)
+_revoked_tokens_lock = threading.Lock()
+
+
+def _revoked_token_key(token: str) -> str:
+    """Build the denylist key for a refresh token (hashed, never raw)."""
+    digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    return f"{_REVOKED_TOKEN_PREFIX}{digest}"
+
+
+def _mark_token_revoked(token: str) -> None:
+    """Add a refresh token to the revocation denylist."""
+    key = _revoked_token_key(token)
+
+    with _revoked_tokens_lock:
+        _revoked_tokens_local[key] = True
+
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+            redis_client.setex(key, ttl, "1")
+        except Exception:
+            # DB row stays revoked either way; the denylist is an
+            # optimization, not the source of truth
+            pass
+
+
+def _check_token_revoked(token: str) -> Optional[bool]:
+    """
+    Check the denylist for a refresh token.
+
+    Returns:
+        True if the token is known revoked, False if Redis answered
+        authoritatively that it is not, or None when only the DB can
+        decide (no Redis, or Redis unavailable)
+    """
+    key = _revoked_token_key(token)
+
+    with _revoked_tokens_lock:
+        if key in _revoked_tokens_local:
+            return True
+
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            return bool(redis_client.exists(key))
+        except Exception:
+            return None
+
+    return None
+
+
+async def get_user_auth_snapshot(db: AsyncSession, user_id: str) -> Optional[Tuple]:
+    """
+    Get the (role, is_active, full_name, email) snapshot for a user.
+
+    Served from a 10-second process-local cache; on a miss only the four
+    authorization columns are selected, not the full row. Use this for
+    role/active checks - endpoints that mutate the user still need the
+    ORM instance via get_user_by_id.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+
+    Returns:
+        Tuple of (role, is_active, full_name, email), or None if the
+        user does not exist
+    """
+    with _auth_snapshot_lock:
+        snapshot = _auth_snapshot_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    row = (await db.execute(
+        select(User.role, User.is_active, User.full_name, User.email)
+        .where(User.id == user_id)
+    )).one_or_none()
+    if row is None:
+        return None
+
+    snapshot = tuple(row)
+    with _auth_snapshot_lock:
+        _auth_snapshot_cache[user_id] = snapshot
+    return snapshot
+
 
-def create_user(db: Session, email: str, password: str, full_name: str, role: str = "staff") -> User:
+def invalidate_user_snapshot(user_id: str) -> None:
+    """
+    Drop a user's cached auth snapshot (call after mutating the user).
+
+    Args:
+        user_id: User ID whose snapshot should be evicted
+    """
+    with _auth_snapshot_lock:
+        _auth_snapshot_cache.pop(user_id, None)
+
+
+async def create_user(db: AsyncSession, email: str, password: str, full_name: str, role: str = "staff") -> User:
     """Create a new user."""
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    # Check if user already exists. lower(email) matches the functional
+    # unique index, so the check is both indexed and case-insensitive.
+    existing_user = (await db.execute(
+        select(User).where(func.lower(User.email) == email.lower()).limit(1)
+    )).scalars().first()
     if existing_user:
         raise ConflictException("Email already registered", field="email")
 
     # Create new user
     user = User(
         email=email,
-        hashed_password=get_password_hash(password),
+        hashed_password=await get_password_hash_async(password),
         full_name=full_name,
         role=role,
         is_active=True,
         is_verified=False
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+
+    # Seed the email lookup cache so the first login skips the scan
+    with _email_id_lock:
+        _email_id_cache[user.email.lower()] = user.id
 
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_user_by_email(db, email)
 
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    # OAuth-only accounts store an empty hash; they can never log in
+    # with a password (and passlib would error on the empty string)
+    if not user.hashed_password:
+        return None
+
+    # Verification delegates to bcrypt.checkpw, which compares digests
+    # in constant time - never compare hashes with ==. The async wrapper
+    # runs the CPU-heavy verify on the hashing thread pool so the event
+    # loop keeps serving other requests meanwhile.
+    if not await verify_password_async(password, user.hashed_password):
         return None
 
     if not user.is_active:
@@ -57,7 +199,7 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
-def create_tokens_for_user(db: Session, user: User) -> dict:
+async def create_tokens_for_user(db: AsyncSession, user: User) -> dict:
     """Create access and refresh tokens for a user."""
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id), "email": user.email, "role": user.role})
@@ -65,16 +207,20 @@ def create_tokens_for_user(db: Session, user: User) -> dict:
     # Create refresh token
     refresh_token_str = create_refresh_token(data={"sub": str(user.id)})
 
-    # Save refresh token to database
-    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token = RefreshToken(
-        user_id=user.id,
-        token=refresh_token_str,
-        expires_at=expires_at,
-        created_at=datetime.utcnow()
+    # Save refresh token with a Core INSERT: this fires on every login
+    # and refresh, and nothing reads the row object afterwards, so the
+    # ORM unit-of-work bookkeeping (add/flush/identity-map entry) is
+    # pure overhead here. One statement, then commit.
+    now = datetime.utcnow()
+    await db.execute(
+        insert(RefreshToken).values(
+            user_id=user.id,
+            token=refresh_token_str,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            created_at=now
+        )
     )
-    db.add(refresh_token)
-    db.commit()
+    await db.commit()
 
     return {
         "access_token": access_token,
@@ -83,7 +229,7 @@ def create_tokens_for_user(db: Session, user: User) -> dict:
     }
 
 
-def refresh_access_token(db: Session, refresh_token_str: str) -> dict:
+async def refresh_access_token(db: AsyncSession, refresh_token_str: str) -> dict:
     """Refresh access token using refresh token."""
     # Verify refresh token
     payload = verify_token(refresh_token_str, token_type="refresh")
@@ -94,63 +240,141 @@ def refresh_access_token(db: Session, refresh_token_str: str) -> dict:
     if not user_id:
         raise UnauthorizedException("Invalid refresh token")
 
-    # Check if refresh token exists and is not revoked
-    refresh_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token_str,
-        RefreshToken.revoked == False
-    ).first()
-
-    if not refresh_token:
+    # Denylist check first: known-revoked tokens are rejected without
+    # touching the database
+    revoked = _check_token_revoked(refresh_token_str)
+    if revoked is True:
         raise UnauthorizedException("Refresh token revoked or not found")
 
-    # Check if expired
-    if refresh_token.expires_at < datetime.utcnow():
-        raise UnauthorizedException("Refresh token expired")
+    if revoked is None:
+        # No authoritative denylist answer - fall back to the row lookup.
+        # (With Redis the signature check above plus the shared denylist
+        # already cover issuance, revocation and expiry, so the hot path
+        # skips this query entirely.)
+        refresh_token = (await db.execute(
+            select(RefreshToken).where(
+                RefreshToken.token == refresh_token_str,
+                RefreshToken.revoked == False
+            ).limit(1)
+        )).scalars().first()
+
+        if not refresh_token:
+            raise UnauthorizedException("Refresh token revoked or not found")
+
+        # Check if expired
+        if refresh_token.expires_at < datetime.utcnow():
+            raise UnauthorizedException("Refresh token expired")
 
     # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user or not user.is_active:
         raise UnauthorizedException("User not found or inactive")
 
     # Create new tokens
-    return create_tokens_for_user(db, user)
+    return await create_tokens_for_user(db, user)
 
 
-def revoke_refresh_token(db: Session, refresh_token_str: str) -> bool:
+async def revoke_refresh_token(db: AsyncSession, refresh_token_str: str) -> bool:
     """Revoke a refresh token."""
-    refresh_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token_str
-    ).first()
+    refresh_token = (await db.execute(
+        select(RefreshToken).where(
+            RefreshToken.token == refresh_token_str
+        ).limit(1)
+    )).scalars().first()
 
     if refresh_token:
         refresh_token.revoked = True
-        db.commit()
+        await db.commit()
+
+        # Write-through to the denylist so every worker rejects this
+        # token immediately, without a row lookup
+        _mark_token_revoked(refresh_token_str)
+
+        # Late import to avoid a circular import (dependencies imports this module)
+        from ..dependencies import invalidate_token
+        invalidate_token(refresh_token_str)
+
         return True
 
     return False
 
 
-def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
-    """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+async def purge_expired_refresh_tokens(db: AsyncSession) -> int:
+    """
+    Delete refresh tokens past their expiry date.
 
+    Expired rows can never authenticate again (refresh_access_token
+    checks expires_at), but left in place they grow the table and slow
+    the token lookup on the refresh path. One bulk DELETE, meant to be
+    triggered by a scheduled task.
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    Args:
+        db: Async database session
 
+    Returns:
+        int: Number of tokens deleted
+    """
+    result = await db.execute(
+        delete(RefreshToken).where(RefreshToken.expires_at < datetime.utcnow()),
+        execution_options={"synchronize_session": False}
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Get user by ID.
+
+    Session.get() checks the identity map first (no query at all when the
+    user is already loaded in this session) and uses the primary-key
+    lookup path on a miss - this runs on every authenticated request.
+    """
+    return await db.get(User, user_id)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    Get user by email.
+
+    A cached email -> id mapping turns repeat lookups (login, OAuth)
+    into primary-key gets. The mapping is self-correcting: if the hit is
+    stale (the user changed their email), the loaded row no longer
+    matches and the lookup falls through to the real query.
+
+    Matching is case-insensitive: the query compares lower(email) so it
+    is served by the ix_users_email_lower functional index, and the
+    cache is keyed on the lowercased address.
+    """
+    email_lower = email.lower()
+
+    with _email_id_lock:
+        cached_id = _email_id_cache.get(email_lower)
+    if cached_id is not None:
+        user = await db.get(User, cached_id)
+        if user is not None and user.email.lower() == email_lower:
+            return user
+
+    user = (await db.execute(
+        select(User).where(func.lower(User.email) == email_lower).limit(1)
+    )).scalars().first()
+    if user is not None:
+        with _email_id_lock:
+            _email_id_cache[user.email.lower()] = user.id
+    return user
 
-def create_or_update_oauth_user(db: Session, email: str, full_name: str, provider: str = "google") -> User:
+
+async def create_or_update_oauth_user(db: AsyncSession, email: str, full_name: str, provider: str = "google") -> User:
     """Create or update user from OAuth."""
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email(db, email)
 
     if user:
         # Update existing user
         user.oauth_provider = provider
         user.is_verified = True
         user.is_active = True
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        invalidate_user_snapshot(user.id)
     else:
         # Create new user (no password for OAuth users)
         user = User(
@@ -163,7 +387,9 @@ def create_or_update_oauth_user(db: Session, email: str, full_name: str, provide
             role="staff"
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+
+    with _email_id_lock:
+        _email_id_cache[user.email.lower()] = user.id
 
     return user
@@ -3,20 +3,28 @@ Dashboard analytics and reporting service.
 """
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, case, or_, select, desc
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
+from ..cache import cached_aggregate
+from ..utils import as_decimal
 from ..models.member import Member
-from ..models.purchase import Purchase
+from ..models.purchase import Purchase, RolloverStatus
 from ..models.session import GamingSession
 from ..services import sessions_service
 
 
+@cached_aggregate("overall_stats", ttl=30)
 def get_overall_stats(db: Session, branch_id: Optional[str] = None) -> dict:
     """
     Get overall dashboard statistics.
 
+    Previously ~8 separate count()/sum() round-trips, most scanning the
+    same tables; now three statements (one per table) using conditional
+    SUM(CASE) aggregates, so each table is scanned once and the network
+    cost drops to 3 RTTs.
+
     Args:
         db: Database session
         branch_id: Optional filter by branch
@@ -24,80 +32,70 @@ def get_overall_stats(db: Session, branch_id: Optional[str] = None) -> dict:
     Returns:
         dict: Overall statistics
     """
-    # Base queries
-    member_query = db.query(Member)
-    purchase_query = db.query(Purchase)
+    today = date.today()
+    thirty_days_later = today + timedelta(days=30)
 
+    # Members: every member-derived stat from one pass over the table
+    member_stmt = select(
+        func.count(Member.id),
+        func.sum(case((or_(Member.expiry_date >= today, Member.expiry_date.is_(None)), 1), else_=0)),
+        func.sum(case((Member.expiry_date < today, 1), else_=0)),
+        func.sum(Member.total_hours_granted),
+        func.sum(Member.total_hours_used),
+        func.sum(case((and_(Member.expiry_date >= today, Member.expiry_date <= thirty_days_later), 1), else_=0))
+    )
     if branch_id:
-        member_query = member_query.filter(Member.branch_id == branch_id)
-        purchase_query = purchase_query.join(Member).filter(Member.branch_id == branch_id)
+        member_stmt = member_stmt.where(Member.branch_preferred_id == branch_id)
+
+    (
+        total_members, active_members, expired_members,
+        total_hours_granted, total_hours_used, members_expiring_soon
+    ) = db.execute(member_stmt).one()
+
+    # SUM over zero rows is NULL, not 0; as_decimal is a bare isinstance
+    # check when the driver already returned Decimal (the normal case)
+    active_members = active_members or 0
+    expired_members = expired_members or 0
+    total_hours_granted = as_decimal(total_hours_granted)
+    total_hours_used = as_decimal(total_hours_used)
+
+    # Purchases: revenue and pending rollovers in one pass
+    purchase_stmt = select(
+        func.sum(Purchase.amount_paid),
+        func.sum(case((Purchase.rollover_status == RolloverStatus.PENDING, 1), else_=0))
+    )
+    if branch_id:
+        # branch_id is denormalized onto purchases, so the filter hits
+        # ix_purchases_branch_date directly instead of joining members
+        purchase_stmt = purchase_stmt.where(Purchase.branch_id == branch_id)
 
-    # Total members
-    total_members = member_query.count()
+    total_revenue, pending_rollovers = db.execute(purchase_stmt).one()
+    total_revenue = as_decimal(total_revenue)
 
-    # Active members (not expired)
-    today = date.today()
-    active_members = member_query.filter(
-        or_(
-            Member.expiry_date >= today,
-            Member.expiry_date.is_(None)
+    # Sessions: active count (deliberately global, as before)
+    active_sessions = db.execute(
+        select(func.count()).select_from(GamingSession).where(
+            GamingSession.time_end.is_(None)
         )
-    ).count()
-
-    # Expired members
-    expired_members = member_query.filter(Member.expiry_date < today).count()
-
-    # Total revenue
-    total_revenue = purchase_query.with_entities(
-        func.sum(Purchase.amount_paid)
-    ).scalar() or Decimal("0.0")
+    ).scalar()
 
-    # Total hours granted
-    total_hours_granted = member_query.with_entities(
-        func.sum(Member.total_hours_granted)
-    ).scalar() or Decimal("0.0")
-
-    # Total hours used
-    total_hours_used = member_query.with_entities(
-        func.sum(Member.total_hours_used)
-    ).scalar() or Decimal("0.0")
-
-    # Total balance hours
     total_balance_hours = total_hours_granted - total_hours_used
 
-    # Active sessions
-    active_sessions = db.query(GamingSession).filter(
-        GamingSession.time_end.is_(None)
-    ).count()
-
-    # Members expiring in next 30 days
-    thirty_days_later = today + timedelta(days=30)
-    members_expiring_soon = member_query.filter(
-        and_(
-            Member.expiry_date >= today,
-            Member.expiry_date <= thirty_days_later
-        )
-    ).count()
-
-    # Pending rollovers
-    pending_rollovers = purchase_query.filter(
-        Purchase.rollover_status == "pending"
-    ).count()
-
     return {
         "total_members": total_members,
         "active_members": active_members,
         "expired_members": expired_members,
-        "total_revenue": Decimal(str(total_revenue)),
-        "total_hours_granted": Decimal(str(total_hours_granted)),
-        "total_hours_used": Decimal(str(total_hours_used)),
-        "total_balance_hours": Decimal(str(total_balance_hours)),
+        "total_revenue": total_revenue,
+        "total_hours_granted": total_hours_granted,
+        "total_hours_used": total_hours_used,
+        "total_balance_hours": total_balance_hours,
         "active_sessions": active_sessions,
-        "members_expiring_soon": members_expiring_soon,
-        "pending_rollovers": pending_rollovers
+        "members_expiring_soon": members_expiring_soon or 0,
+        "pending_rollovers": pending_rollovers or 0
     }
 
 
+@cached_aggregate("revenue_stats", ttl=60)
 def get_revenue_stats(db: Session, branch_id: Optional[str] = None) -> dict:
     """
     Get revenue analytics.
@@ -112,7 +110,8 @@ def get_revenue_stats(db: Session, branch_id: Optional[str] = None) -> dict:
     query = db.query(Purchase)
 
     if branch_id:
-        query = query.join(Member).filter(Member.branch_id == branch_id)
+        # Denormalized branch filter - no members join per row
+        query = query.filter(Purchase.branch_id == branch_id)
 
     # Total revenue
     total_revenue = query.with_entities(func.sum(Purchase.amount_paid)).scalar() or Decimal("0.0")
@@ -153,16 +152,18 @@ def get_revenue_stats(db: Session, branch_id: Optional[str] = None) -> dict:
     #     payment_methods[method] = float(amount)
 
     return {
-        "total_revenue": Decimal(str(total_revenue)),
-        "revenue_this_month": Decimal(str(revenue_this_month)),
-        "revenue_last_month": Decimal(str(revenue_last_month)),
-        "average_purchase_value": Decimal(str(average_purchase_value)),
+        # Already Decimal (the sums are coalesced with Decimal("0.0"))
+        "total_revenue": total_revenue,
+        "revenue_this_month": revenue_this_month,
+        "revenue_last_month": revenue_last_month,
+        "average_purchase_value": average_purchase_value,
         "total_purchases": total_purchases,
         "purchases_this_month": purchases_this_month
         # "payment_methods": payment_methods  # TODO: Add after implementing payment_method field
     }
 
 
+@cached_aggregate("expiring_members", ttl=60)
 def get_expiring_members(
     db: Session,
     days: int = 30,
@@ -182,7 +183,12 @@ def get_expiring_members(
     today = date.today()
     future_date = today + timedelta(days=days)
 
-    query = db.query(Member).filter(
+    # Core column select: only the five reported columns come back, no
+    # ORM hydration and no lazy-load risk from the member relationships
+    stmt = select(
+        Member.id, Member.full_name, Member.mobile,
+        Member.balance_hours, Member.expiry_date
+    ).where(
         and_(
             Member.expiry_date >= today,
             Member.expiry_date <= future_date
@@ -190,25 +196,32 @@ def get_expiring_members(
     )
 
     if branch_id:
-        query = query.filter(Member.branch_id == branch_id)
-
-    members = query.order_by(Member.expiry_date.asc()).all()
-
+        stmt = stmt.where(Member.branch_preferred_id == branch_id)
+
+    # Server-side cursor (named cursor on Postgres): rows arrive in
+    # 1000-row batches instead of the driver buffering the whole result
+    # before the first dict is built. The final list still materializes
+    # - the cached_aggregate layer and the response's total require it -
+    # but peak memory is one driver batch plus the small output dicts,
+    # not a second full copy of every row.
     result = []
-    for member in members:
-        days_until_expiry = (member.expiry_date - today).days
+    for row in db.execute(
+        stmt.order_by(Member.expiry_date.asc())
+        .execution_options(stream_results=True, yield_per=1000)
+    ):
         result.append({
-            "member_id": member.id,
-            "full_name": member.full_name,
-            "mobile": member.mobile,
-            "balance_hours": member.balance_hours,
-            "expiry_date": member.expiry_date,
-            "days_until_expiry": days_until_expiry
+            "member_id": row.id,
+            "full_name": row.full_name,
+            "mobile": row.mobile,
+            "balance_hours": row.balance_hours,
+            "expiry_date": row.expiry_date,
+            "days_until_expiry": (row.expiry_date - today).days
         })
 
     return result
 
 
+@cached_aggregate("top_members", ttl=60)
 def get_top_members(
     db: Session,
     limit: int = 10,
@@ -227,38 +240,48 @@ def get_top_members(
     Returns:
         List[dict]: List of top members
     """
-    query = db.query(Member)
+    # One aggregated statement replaces the old per-member purchase
+    # fetch loop (an N+1: 1 query for the members + 1 per member for
+    # their purchases just to count/sum them)
+    total_spent = func.coalesce(func.sum(Purchase.amount_paid), 0).label("total_spent")
+    total_purchases = func.count(Purchase.id).label("total_purchases")
+
+    stmt = select(
+        Member.id, Member.full_name, Member.mobile,
+        Member.total_hours_used, total_purchases, total_spent
+    ).outerjoin(
+        Purchase, Purchase.member_id == Member.id
+    ).group_by(
+        Member.id, Member.full_name, Member.mobile, Member.total_hours_used
+    )
 
     if branch_id:
-        query = query.filter(Member.branch_id == branch_id)
+        stmt = stmt.where(Member.branch_preferred_id == branch_id)
 
     if by == "usage":
-        members = query.order_by(Member.total_hours_used.desc()).limit(limit).all()
+        stmt = stmt.order_by(Member.total_hours_used.desc())
     else:  # by spending
-        # Join with purchases to get total spent
-        members = query.join(Purchase).group_by(Member.id).order_by(
-            func.sum(Purchase.amount_paid).desc()
-        ).limit(limit).all()
+        stmt = stmt.order_by(desc("total_spent"))
 
-    result = []
-    for member in members:
-        # Get member's total purchases and spending
-        purchases = db.query(Purchase).filter(Purchase.member_id == member.id).all()
-        total_purchases = len(purchases)
-        total_spent = sum(p.amount_paid for p in purchases)
+    rows = db.execute(stmt.limit(limit)).all()
 
+    result = []
+    for row in rows:
         result.append({
-            "member_id": member.id,
-            "full_name": member.full_name,
-            "mobile": member.mobile,
-            "total_hours_used": member.total_hours_used,
-            "total_purchases": total_purchases,
-            "total_spent": Decimal(str(total_spent))
+            "member_id": row.id,
+            "full_name": row.full_name,
+            "mobile": row.mobile,
+            "total_hours_used": row.total_hours_used,
+            "total_purchases": row.total_purchases,
+            # coalesce(..., 0) can come back as int when a member has no
+            # purchases; as_decimal normalizes without re-parsing Decimals
+            "total_spent": as_decimal(row.total_spent)
         })
 
     return result
 
 
+@cached_aggregate("revenue_chart", ttl=60)
 def get_revenue_chart_data(
     db: Session,
     start_date: date,
@@ -275,35 +298,50 @@ def get_revenue_chart_data(
         branch_id: Optional filter by branch
 
     Returns:
-        dict: Revenue chart data
+        dict: Revenue chart data with one point per day (zero-filled)
     """
-    query = db.query(
-        Purchase.purchase_date,
-        func.sum(Purchase.amount_paid).label('revenue'),
-        func.count(Purchase.id).label('purchases')
-    ).filter(
+    # Bucket by calendar day in SQL: date() compiles on both Postgres
+    # and SQLite, so the index range scan and the grouping happen in one
+    # query. purchase_date is a DateTime - grouping on the raw column
+    # produced one bucket per timestamp, not per day.
+    day = func.date(Purchase.purchase_date).label("day")
+    stmt = select(
+        day,
+        func.sum(Purchase.amount_paid).label("revenue"),
+        func.count(Purchase.id).label("purchases")
+    ).where(
         and_(
             Purchase.purchase_date >= start_date,
-            Purchase.purchase_date <= end_date
+            # exclusive upper bound so the end day's later purchases count
+            Purchase.purchase_date < end_date + timedelta(days=1)
         )
-    ).group_by(Purchase.purchase_date)
+    ).group_by(day)
 
     if branch_id:
-        query = query.join(Member).filter(Member.branch_id == branch_id)
+        # Denormalized branch filter - no members join per row
+        stmt = stmt.where(Purchase.branch_id == branch_id)
 
-    results = query.all()
+    # Densify against the requested range so the chart gets a point for
+    # every day, including zero-revenue ones. A dict lookup per day
+    # replaces per-day queries; generate_series would push this into SQL
+    # but is Postgres-only and would ship the zero rows over the wire,
+    # so the portable merge stays in Python. (date() returns a date on
+    # Postgres and an ISO string on SQLite - str()[:10] covers both.)
+    by_day = {str(row.day)[:10]: row for row in db.execute(stmt).all()}
 
-    # Create daily data points
     data = []
     total_revenue = Decimal("0.0")
-
-    for row in results:
+    current = start_date
+    while current <= end_date:
+        row = by_day.get(current.isoformat())
+        revenue = as_decimal(row.revenue) if row else Decimal("0.0")
         data.append({
-            "date": row.purchase_date.isoformat(),
-            "revenue": Decimal(str(row.revenue)),
-            "purchases": row.purchases
+            "date": current.isoformat(),
+            "revenue": revenue,
+            "purchases": row.purchases if row else 0
         })
-        total_revenue += Decimal(str(row.revenue))
+        total_revenue += revenue
+        current += timedelta(days=1)
 
     return {
         "data": data,
@@ -2,13 +2,28 @@
 Member management service with business logic.
 """
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, func, tuple_
+from sqlalchemy.exc import IntegrityError
 from datetime import date
 
 from ..models.member import Member
-from ..exceptions import ConflictException, NotFoundException
-from ..utils import normalize_mobile
+from ..exceptions import ConflictException, NotFoundException, ValidationException
+from ..utils import normalize_mobile, encode_cursor, decode_cursor
+
+
+def _normalize_mobile_or_raise(mobile: str) -> str:
+    """
+    Normalize a mobile number, raising ValidationException on bad input.
+
+    The members table enforces exactly 10 digits (CHECK constraint), so
+    invalid numbers must be rejected here with a 400 rather than
+    surfacing as a database error on insert.
+    """
+    try:
+        return normalize_mobile(mobile)
+    except ValueError as exc:
+        raise ValidationException(str(exc), field="mobile")
 
 
 def create_member(
@@ -16,8 +31,7 @@ def create_member(
     full_name: str,
     mobile: str,
     email: Optional[str] = None,
-    branch_id: Optional[str] = None,
-    notes: Optional[str] = None
+    branch_id: Optional[str] = None
 ) -> Member:
     """
     Create a new member.
@@ -27,48 +41,70 @@ def create_member(
         full_name: Member's full name
         mobile: Mobile number (will be normalized)
         email: Optional email address
-        branch_id: Optional branch assignment
-        notes: Optional notes
+        branch_id: Optional preferred branch assignment
 
     Returns:
         Member: Created member instance
 
     Raises:
         ConflictException: If mobile number already exists
+        ValidationException: If mobile number cannot be normalized
     """
     # Normalize mobile number
-    normalized_mobile = normalize_mobile(mobile)
+    normalized_mobile = _normalize_mobile_or_raise(mobile)
 
-    # Check if mobile already exists
-    existing = db.query(Member).filter(Member.mobile == normalized_mobile).first()
-    if existing:
-        raise ConflictException("Mobile number already registered", field="mobile")
-
-    # Create new member
+    # Create new member. registration_date is NOT NULL with no server
+    # default, so it is set here.
     member = Member(
         full_name=full_name,
         mobile=normalized_mobile,
         email=email,
-        branch_id=branch_id,
-        notes=notes
+        branch_preferred_id=branch_id,
+        registration_date=date.today()
     )
 
     db.add(member)
-    db.commit()
-    db.refresh(member)
 
+    # No pre-SELECT: the unique index on mobile performs the duplicate
+    # check in-index during the INSERT, which is both one round-trip
+    # cheaper on the happy path and race-free under concurrent creates
+    # (a SELECT-then-INSERT can pass the check twice).
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ConflictException("Mobile number already registered", field="mobile")
+
+    # No refresh needed: the INSERT's RETURNING already populated the
+    # server-generated columns (timestamps, balance_hours) at flush
     return member
 
 
 def get_member_by_id(db: Session, member_id: str) -> Optional[Member]:
-    """Get member by ID."""
-    return db.query(Member).filter(Member.id == member_id).first()
+    """
+    Get member by ID.
+
+    Eager-loads purchases and sessions in one batched query each
+    (selectinload) so member detail views don't lazy-load N times.
+    """
+    return db.query(Member).options(
+        selectinload(Member.purchases),
+        selectinload(Member.sessions)
+    ).filter(Member.id == member_id).first()
 
 
 def get_member_by_mobile(db: Session, mobile: str) -> Optional[Member]:
-    """Get member by mobile number."""
+    """
+    Get member by mobile number.
+
+    Eager-loads purchases and sessions alongside the member (see
+    get_member_by_id) since mobile lookup backs the same detail views.
+    """
     normalized_mobile = normalize_mobile(mobile)
-    return db.query(Member).filter(Member.mobile == normalized_mobile).first()
+    return db.query(Member).options(
+        selectinload(Member.purchases),
+        selectinload(Member.sessions)
+    ).filter(Member.mobile == normalized_mobile).first()
 
 
 def update_member(
@@ -77,8 +113,7 @@ def update_member(
     full_name: Optional[str] = None,
     mobile: Optional[str] = None,
     email: Optional[str] = None,
-    branch_id: Optional[str] = None,
-    notes: Optional[str] = None
+    branch_id: Optional[str] = None
 ) -> Member:
     """
     Update member information.
@@ -89,8 +124,7 @@ def update_member(
         full_name: New full name (optional)
         mobile: New mobile number (optional, will be normalized)
         email: New email (optional)
-        branch_id: New branch assignment (optional)
-        notes: New notes (optional)
+        branch_id: New preferred branch assignment (optional)
 
     Returns:
         Member: Updated member instance
@@ -108,27 +142,23 @@ def update_member(
         member.full_name = full_name
 
     if mobile is not None:
-        normalized_mobile = normalize_mobile(mobile)
-        # Check if new mobile is already taken by another member
-        existing = db.query(Member).filter(
-            Member.mobile == normalized_mobile,
-            Member.id != member_id
-        ).first()
-        if existing:
-            raise ConflictException("Mobile number already in use", field="mobile")
+        normalized_mobile = _normalize_mobile_or_raise(mobile)
+        # The unique index rejects a mobile taken by another member at
+        # commit time (see create_member); assigning our own current
+        # number back is a no-op the ORM doesn't even flush
         member.mobile = normalized_mobile
 
     if email is not None:
         member.email = email
 
     if branch_id is not None:
-        member.branch_id = branch_id
+        member.branch_preferred_id = branch_id
 
-    if notes is not None:
-        member.notes = notes
-
-    db.commit()
-    db.refresh(member)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ConflictException("Mobile number already in use", field="mobile")
 
     return member
 
@@ -165,25 +195,43 @@ def search_members(
     branch_id: Optional[str] = None,
     is_expired: Optional[bool] = None,
     page: int = 1,
-    page_size: int = 50
-) -> Tuple[list[Member], int]:
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False
+) -> Tuple[list[Member], Optional[int], Optional[str]]:
     """
     Search members with pagination and filters.
 
+    Two pagination modes:
+    - Legacy offset mode (default): runs a COUNT per page and returns
+      the total alongside the rows.
+    - Keyset mode (use_cursor=True or a cursor given): seeks past the
+      (created_at, id) of the last row already seen, so deep pages cost
+      the same as page one and no COUNT is issued. Returns a
+      next_cursor instead of a total.
+
     Args:
         db: Database session
         search: Search term for name or mobile (optional)
         branch_id: Filter by branch (optional)
         is_expired: Filter by expiry status (optional)
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, offset mode only)
         page_size: Number of items per page
+        cursor: Opaque cursor from a previous keyset page (optional)
+        use_cursor: Use keyset pagination for the first page
 
     Returns:
-        Tuple[list[Member], int]: List of members and total count
+        (members, total, next_cursor): total is None in keyset mode;
+        next_cursor is None in offset mode or on the last keyset page
+
+    Raises:
+        ValidationException: If the cursor is malformed
     """
     query = db.query(Member)
 
-    # Apply search filter
+    # Apply search filter. The leading-wildcard patterns are served by
+    # pg_trgm GIN indexes on full_name and mobile on PostgreSQL (see
+    # migration b6f4a81c3d95); B-tree indexes can't help here.
     if search:
         # Normalize search if it looks like a mobile number
         normalized_search = normalize_mobile(search) if search.isdigit() else search
@@ -196,7 +244,7 @@ def search_members(
 
     # Apply branch filter
     if branch_id:
-        query = query.filter(Member.branch_id == branch_id)
+        query = query.filter(Member.branch_preferred_id == branch_id)
 
     # Apply expiry filter
     if is_expired is not None:
@@ -211,6 +259,29 @@ def search_members(
                 )
             )
 
+    if use_cursor or cursor:
+        if cursor:
+            try:
+                last_created_at, last_id = decode_cursor(cursor)
+            except ValueError as exc:
+                raise ValidationException(str(exc), field="cursor")
+            query = query.filter(
+                tuple_(Member.created_at, Member.id) < (last_created_at, last_id)
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        members = query.order_by(
+            Member.created_at.desc(), Member.id.desc()
+        ).limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(members) > page_size:
+            members = members[:page_size]
+            last = members[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return members, None, next_cursor
+
     # Get total count
     total = query.count()
 
@@ -218,4 +289,21 @@ def search_members(
     offset = (page - 1) * page_size
     members = query.order_by(Member.created_at.desc()).offset(offset).limit(page_size).all()
 
-    return members, total
+    return members, total, None
+
+
+def iter_members(db: Session, batch_size: int = 500):
+    """
+    Iterate over all members without loading the full table into memory.
+
+    Uses yield_per so the driver fetches rows in batches; callers (the
+    streaming export endpoint) serialize each row as it arrives.
+
+    Args:
+        db: Database session
+        batch_size: Rows fetched per database round-trip
+
+    Yields:
+        Member: One member at a time, ordered by creation date
+    """
+    yield from db.query(Member).order_by(Member.created_at.desc()).yield_per(batch_size)
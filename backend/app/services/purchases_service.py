@@ -2,15 +2,18 @@
 Purchase/Credits management service with 180-day rollover business logic.
 """
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date, timedelta
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import bindparam, case, exists, func, insert, or_, select, tuple_, update
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from ..models.purchase import Purchase
+from ..cache import invalidate_dashboard_cache
+from ..models.purchase import Purchase, RolloverStatus
 from ..models.member import Member
 from ..exceptions import ConflictException, NotFoundException, ValidationException
 from ..services import members_service
+from ..utils import encode_cursor, decode_cursor
 
 
 def create_purchase(
@@ -18,8 +21,8 @@ def create_purchase(
     member_id: str,
     hours_purchased: Decimal,
     amount_paid: Decimal,
-    payment_method: str = "cash",
-    payment_reference: Optional[str] = None,
+    created_by: str,
+    plan_name: Optional[str] = None,
     purchase_date: Optional[date] = None
 ) -> Purchase:
     """
@@ -37,8 +40,8 @@ def create_purchase(
         member_id: Member ID
         hours_purchased: Number of hours to grant
         amount_paid: Amount paid in PHP
-        payment_method: Payment method (cash/dodo/card)
-        payment_reference: Optional payment reference
+        created_by: User ID recorded on the purchase
+        plan_name: Optional plan label (defaults to an hours-based one)
         purchase_date: Optional purchase date (defaults to today)
 
     Returns:
@@ -65,19 +68,25 @@ def create_purchase(
     if amount_paid < 0:
         raise ValidationException("Amount paid cannot be negative")
 
-    # Use today if purchase_date not provided
-    if purchase_date is None:
-        purchase_date = date.today()
+    # purchase_date is a DateTime column; a supplied date lands at
+    # midnight, otherwise record the current moment
+    purchase_dt = (
+        datetime.combine(purchase_date, datetime.min.time())
+        if purchase_date else datetime.utcnow()
+    )
 
-    # Create purchase record
+    # Create purchase record (rollover_status comes from the column
+    # default, PENDING)
     purchase = Purchase(
         member_id=member_id,
-        purchase_date=purchase_date,
-        hours_purchased=hours_purchased,
+        mobile=member.mobile,
+        branch_id=member.branch_preferred_id,
+        plan_name=plan_name or f"{hours_purchased} Hours Plan",
         amount_paid=amount_paid,
-        payment_method=payment_method,
-        payment_reference=payment_reference,
-        rollover_status="pending"
+        hours_granted=hours_purchased,
+        total_valid_purchased=hours_purchased,
+        purchase_date=purchase_dt,
+        created_by=created_by
     )
 
     # Calculate expiry dates (this is done automatically in the model's __init__)
@@ -93,13 +102,141 @@ def create_purchase(
     if member.expiry_date is None or purchase.expiry_date > member.expiry_date:
         member.expiry_date = purchase.expiry_date
 
+    # Every attribute below was set in Python; server-generated columns
+    # come back via RETURNING at flush (eager_defaults), so the two
+    # refresh round-trips here were pure overhead
     db.commit()
-    db.refresh(purchase)
-    db.refresh(member)
+
+    # New purchases change every dashboard aggregate
+    invalidate_dashboard_cache()
 
     return purchase
 
 
+def create_purchases_bulk(db: Session, purchases: list[dict], created_by: str) -> int:
+    """
+    Bulk-create purchases in one INSERT and one commit.
+
+    Calling create_purchase in a loop costs one commit and several
+    round-trips per row. This path validates all rows up front, inserts
+    them with a single executemany INSERT, and folds the member-side
+    updates (hours granted, expiry extension) into one grouped UPDATE
+    per distinct member - so an import of N purchases is two statements
+    and one commit regardless of N.
+
+    Rollover evaluation is intentionally skipped here: imports record
+    historical purchases, and rollovers remain an explicit per-purchase
+    workflow (apply_rollover).
+
+    Args:
+        db: Database session
+        purchases: Rows with member_id, plan_name, hours_purchased,
+            amount_paid and optional purchase_date (defaults to today)
+        created_by: User ID recorded on every created purchase
+
+    Returns:
+        int: Number of purchases created
+
+    Raises:
+        NotFoundException: If any referenced member does not exist
+        ValidationException: If any row has invalid hours or amount
+    """
+    if not purchases:
+        return 0
+
+    member_ids = {p["member_id"] for p in purchases}
+    members_by_id = {
+        row.id: row
+        for row in db.execute(
+            select(Member.id, Member.mobile, Member.branch_preferred_id)
+            .where(Member.id.in_(member_ids))
+        )
+    }
+    missing = member_ids - set(members_by_id)
+    if missing:
+        raise NotFoundException("Member", sorted(missing)[0])
+
+    rows = []
+    hours_by_member: dict[str, Decimal] = {}
+    expiry_by_member: dict[str, date] = {}
+    for p in purchases:
+        hours = p["hours_purchased"]
+        if hours <= 0:
+            raise ValidationException("Hours purchased must be greater than 0")
+        if p["amount_paid"] < 0:
+            raise ValidationException("Amount paid cannot be negative")
+
+        purchase_date = p.get("purchase_date")
+        purchase_dt = (
+            datetime.combine(purchase_date, datetime.min.time())
+            if purchase_date else datetime.utcnow()
+        )
+        expiry_date = purchase_dt.date() + timedelta(days=365)
+
+        member_id = p["member_id"]
+        member_row = members_by_id[member_id]
+        rows.append({
+            "member_id": member_id,
+            "mobile": member_row.mobile,
+            "branch_id": member_row.branch_preferred_id,
+            "plan_name": p["plan_name"],
+            "amount_paid": p["amount_paid"],
+            "hours_granted": hours,
+            "total_valid_purchased": hours,
+            "purchase_date": purchase_dt,
+            "expiry_date": expiry_date,
+            "rollover_deadline": expiry_date + timedelta(days=180),
+            "created_by": created_by
+        })
+
+        hours_by_member[member_id] = hours_by_member.get(member_id, Decimal("0.0")) + hours
+        if member_id not in expiry_by_member or expiry_date > expiry_by_member[member_id]:
+            expiry_by_member[member_id] = expiry_date
+
+    # executemany INSERT; id and rollover_status come from the column
+    # defaults, created_at/updated_at from the server defaults
+    db.execute(insert(Purchase), rows)
+
+    # One grouped UPDATE per distinct member: add the imported hours and
+    # push expiry_date forward only if the import extends it (portable
+    # CASE instead of GREATEST, which SQLite lacks). Executed on the
+    # Core connection: the ORM session would reinterpret an
+    # update(Member) + parameter list as bulk-update-by-primary-key and
+    # discard the WHERE clause.
+    db.connection().execute(
+        update(Member)
+        .where(Member.id == bindparam("m_id"))
+        .values(
+            total_hours_granted=Member.total_hours_granted + bindparam("add_hours"),
+            expiry_date=case(
+                (
+                    or_(
+                        Member.expiry_date.is_(None),
+                        Member.expiry_date < bindparam("new_expiry")
+                    ),
+                    bindparam("new_expiry")
+                ),
+                else_=Member.expiry_date
+            )
+        ),
+        [
+            {
+                "m_id": member_id,
+                "add_hours": hours_by_member[member_id],
+                "new_expiry": expiry_by_member[member_id]
+            }
+            for member_id in hours_by_member
+        ]
+    )
+
+    db.commit()
+
+    # Imported purchases change every dashboard aggregate
+    invalidate_dashboard_cache()
+
+    return len(rows)
+
+
 def get_purchase_by_id(db: Session, purchase_id: str) -> Optional[Purchase]:
     """Get purchase by ID."""
     return db.query(Purchase).filter(Purchase.id == purchase_id).first()
@@ -138,20 +275,34 @@ def list_purchases(
     member_id: Optional[str] = None,
     rollover_status: Optional[str] = None,
     page: int = 1,
-    page_size: int = 50
-) -> Tuple[list[Purchase], int]:
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False
+) -> Tuple[list[Purchase], Optional[int], Optional[str]]:
     """
     List all purchases with optional filters.
 
+    Two pagination modes (see members_service.search_members):
+    - Legacy offset mode (default): COUNT per page, total returned.
+    - Keyset mode (use_cursor=True or a cursor given): seeks past the
+      (purchase_date, id) of the last row seen; no COUNT, deep pages
+      stay cheap, and a next_cursor is returned while more rows exist.
+
     Args:
         db: Database session
         member_id: Optional filter by member
         rollover_status: Optional filter by rollover status (pending/completed/expired)
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, offset mode only)
         page_size: Number of items per page
+        cursor: Opaque cursor from a previous keyset page (optional)
+        use_cursor: Use keyset pagination for the first page
 
     Returns:
-        Tuple[list[Purchase], int]: List of purchases and total count
+        (purchases, total, next_cursor): total is None in keyset mode;
+        next_cursor is None in offset mode or on the last keyset page
+
+    Raises:
+        ValidationException: If the cursor is malformed
     """
     query = db.query(Purchase)
 
@@ -162,20 +313,43 @@ def list_purchases(
     if rollover_status:
         query = query.filter(Purchase.rollover_status == rollover_status)
 
+    if use_cursor or cursor:
+        if cursor:
+            try:
+                last_purchase_date, last_id = decode_cursor(cursor)
+            except ValueError as exc:
+                raise ValidationException(str(exc), field="cursor")
+            query = query.filter(
+                tuple_(Purchase.purchase_date, Purchase.id) < (last_purchase_date, last_id)
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        purchases = query.order_by(
+            Purchase.purchase_date.desc(), Purchase.id.desc()
+        ).limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(purchases) > page_size:
+            purchases = purchases[:page_size]
+            last = purchases[-1]
+            next_cursor = encode_cursor(last.purchase_date, last.id)
+
+        return purchases, None, next_cursor
+
     total = query.count()
 
     # Pagination
     offset = (page - 1) * page_size
     purchases = query.order_by(Purchase.purchase_date.desc()).offset(offset).limit(page_size).all()
 
-    return purchases, total
+    return purchases, total, None
 
 
 def apply_rollover(
     db: Session,
     purchase_id: str,
     force: bool = False
-) -> Purchase:
+) -> Tuple[Purchase, Decimal]:
     """
     Apply 180-day rollover to a purchase.
 
@@ -186,9 +360,13 @@ def apply_rollover(
     3. Member must have renewed (bought another plan within 180 days)
     4. Rollover status must be "pending"
 
-    Rollover calculation:
-    - Unused hours = hours_purchased - hours_used_from_this_purchase
-    - These unused hours are added to member's next purchase
+    Previously this flowed through six round-trips (purchase load, two
+    full member loads with eager-loaded histories, a hydrating renewal
+    probe, flush, refresh). Now: one joined SELECT for the purchase and
+    the member's balance, one conditional UPDATE with the renewal
+    existence check folded into its WHERE clause, and one member UPDATE
+    - so the renewal check and the status transition are also atomic
+    under concurrent rollover attempts.
 
     Args:
         db: Database session
@@ -196,7 +374,7 @@ def apply_rollover(
         force: Force rollover even if conditions not met (admin override)
 
     Returns:
-        Purchase: Updated purchase with rollover applied
+        (purchase, rollover hours added to the member's balance)
 
     Raises:
         NotFoundException: If purchase not found
@@ -206,78 +384,99 @@ def apply_rollover(
         - Only unused hours from expired purchases can rollover
         - Rollover must happen within 180 days of expiry
         - Member must have renewed within this window
-        - Once rolled over, status changes to "completed"
-        - If deadline passes, status changes to "expired"
+        - Once rolled over, status changes to "applied"
+        - If deadline passes, status changes to "forfeited"
     """
-    purchase = get_purchase_by_id(db, purchase_id)
-    if not purchase:
+    # One joined round-trip for the purchase and the member balance,
+    # replacing the purchase load plus two full member loads
+    row = db.execute(
+        select(Purchase, Member.balance_hours)
+        .join(Member, Member.id == Purchase.member_id)
+        .where(Purchase.id == purchase_id)
+    ).one_or_none()
+    if row is None:
         raise NotFoundException("Purchase", purchase_id)
+    purchase, balance_hours = row
 
     # Check if already processed
-    if purchase.rollover_status in ["completed", "expired"]:
-        raise ValidationException(f"Purchase rollover already {purchase.rollover_status}")
+    if purchase.rollover_status != RolloverStatus.PENDING:
+        raise ValidationException(
+            f"Purchase rollover already {purchase.rollover_status.value}"
+        )
 
     today = date.today()
 
-    # Validate rollover conditions (unless forced)
+    # Date-window validations (unless forced); these read the already-
+    # loaded row, so failing fast costs nothing extra
     if not force:
-        # Must be after expiry date
         if today <= purchase.expiry_date:
             raise ValidationException(
                 f"Cannot rollover - purchase not yet expired. Expires on {purchase.expiry_date}"
             )
 
-        # Must be before rollover deadline
         if today > purchase.rollover_deadline:
-            purchase.rollover_status = "expired"
+            purchase.rollover_status = RolloverStatus.FORFEITED
             db.commit()
             raise ValidationException(
                 f"Rollover deadline passed on {purchase.rollover_deadline}. Unused hours forfeited."
             )
 
-        # Check if member has renewed (has another purchase after this one's expiry)
-        member = members_service.get_member_by_id(db, purchase.member_id)
-        if not member:
-            raise NotFoundException("Member", purchase.member_id)
-
-        renewal_purchase = db.query(Purchase).filter(
-            Purchase.member_id == purchase.member_id,
-            Purchase.purchase_date > purchase.expiry_date,
-            Purchase.purchase_date <= purchase.rollover_deadline
-        ).first()
-
-        if not renewal_purchase:
-            raise ValidationException(
-                "No renewal found within 180-day window. Member must renew to claim rollover."
-            )
-
-    # Calculate unused hours
-    # Note: In a real implementation, we'd track hours used per purchase
-    # For now, we'll use a simplified calculation
-    member = members_service.get_member_by_id(db, purchase.member_id)
-    if not member:
-        raise NotFoundException("Member", purchase.member_id)
-
-    # Calculate rollover hours
-    # For simplicity: rollover_hours = balance_hours (capped at this purchase's hours)
-    rollover_hours = min(member.balance_hours, purchase.hours_purchased)
-
+    # Rollover hours: member's current balance, capped at this
+    # purchase's granted hours (per-purchase usage is not tracked)
+    rollover_hours = min(balance_hours, purchase.hours_granted)
     if rollover_hours <= 0:
         rollover_hours = Decimal("0.0")
 
-    # Apply rollover
-    purchase.rollover_hours = rollover_hours
-    purchase.rollover_status = "completed"
-    purchase.rollover_applied_at = today
+    # Conditional UPDATE with the renewal existence probe folded into
+    # the WHERE clause: the status flips only if a renewal purchase
+    # exists in the window (EXISTS subquery correlates on member_id), so
+    # check and transition are one statement and race-free
+    conditions = [
+        Purchase.id == purchase_id,
+        Purchase.rollover_status == RolloverStatus.PENDING
+    ]
+    if not force:
+        renewal = aliased(Purchase)
+        conditions.append(
+            exists().where(
+                renewal.member_id == Purchase.member_id,
+                renewal.purchase_date > purchase.expiry_date,
+                renewal.purchase_date <= purchase.rollover_deadline
+            )
+        )
 
-    # Add rollover hours to member's total
-    member.total_hours_granted += rollover_hours
+    result = db.execute(
+        update(Purchase)
+        .where(*conditions)
+        .values(rollover_status=RolloverStatus.APPLIED),
+        execution_options={"synchronize_session": False}
+    )
+
+    if result.rowcount == 0:
+        db.rollback()
+        raise ValidationException(
+            "No renewal found within 180-day window. Member must renew to claim rollover."
+        )
+
+    # Mark the in-memory instance as matching what the UPDATE wrote,
+    # without dirtying it into a second flush
+    set_committed_value(purchase, "rollover_status", RolloverStatus.APPLIED)
+
+    # Add rollover hours to the member's total - direct UPDATE, no
+    # member instance needed
+    db.execute(
+        update(Member)
+        .where(Member.id == purchase.member_id)
+        .values(total_hours_granted=Member.total_hours_granted + rollover_hours),
+        execution_options={"synchronize_session": False}
+    )
 
     db.commit()
-    db.refresh(purchase)
-    db.refresh(member)
 
-    return purchase
+    # Rollovers change member balances and pending-rollover counts
+    invalidate_dashboard_cache()
+
+    return purchase, rollover_hours
 
 
 def check_and_expire_rollovers(db: Session) -> int:
@@ -291,17 +490,23 @@ def check_and_expire_rollovers(db: Session) -> int:
     """
     today = date.today()
 
-    # Find all pending rollovers past deadline
-    expired_purchases = db.query(Purchase).filter(
-        Purchase.rollover_status == "pending",
-        Purchase.rollover_deadline < today
-    ).all()
-
-    count = 0
-    for purchase in expired_purchases:
-        purchase.rollover_status = "expired"
-        count += 1
+    # One set-based UPDATE instead of loading every pending purchase and
+    # flushing a per-row UPDATE. The pending-rollover partial index keeps
+    # the WHERE scan small regardless of total purchase history.
+    result = db.execute(
+        update(Purchase)
+        .where(
+            Purchase.rollover_status == RolloverStatus.PENDING,
+            Purchase.rollover_deadline < today
+        )
+        .values(rollover_status=RolloverStatus.FORFEITED),
+        execution_options={"synchronize_session": False}
+    )
+    count = result.rowcount
 
     db.commit()
 
+    if count:
+        invalidate_dashboard_cache()
+
     return count
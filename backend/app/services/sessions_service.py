@@ -1,38 +1,61 @@
 """
 Gaming session management service with hour tracking.
+
+All functions are async and run on the AsyncSession/asyncpg stack, so
+session-heavy endpoints await their SQL instead of blocking the event
+loop for the duration of each round-trip.
 """
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import func, and_, case, extract, select, tuple_
 from datetime import datetime
 from decimal import Decimal
 
-from ..models.session import GamingSession
+from ..cache import (
+    cached_aggregate,
+    get_cached_count,
+    store_cached_count,
+    invalidate_count_cache,
+    invalidate_dashboard_cache
+)
+from ..models.session import GamingSession, SessionStatus
 from ..models.member import Member
 from ..exceptions import ConflictException, NotFoundException, ValidationException
-from ..services import members_service
+from ..utils import as_decimal, encode_cursor, decode_cursor
+
+# Namespace for cached list totals; bump the version on schema changes
+# that invalidate old entries
+_COUNT_PREFIX = "v1:sessions:count:"
 
 
-def start_session(
-    db: Session,
+async def start_session(
+    db: AsyncSession,
     member_id: str,
+    created_by: str,
     station_id: Optional[str] = None,
-    notes: Optional[str] = None
+    game_title: Optional[str] = None,
+    guru_assigned: Optional[str] = None
 ) -> GamingSession:
     """
     Start a new gaming session for a member.
 
     Validations:
-    - Member must exist
+    - Member must exist and have a preferred branch (sessions are
+      always linked to a branch)
     - Member must have active balance > 0
     - Member must not have another active session
     - Member's plan must not be expired
 
     Args:
-        db: Database session
+        db: Async database session
         member_id: Member ID
-        station_id: Optional gaming station/PC ID
-        notes: Optional session notes
+        created_by: ID of the user starting the session
+        station_id: Optional gaming station/PC ID (stored as table_number)
+        game_title: Optional game being played
+        guru_assigned: Staff member running the session (defaults to
+            the creating user's name in the router)
 
     Returns:
         GamingSession: Created session instance
@@ -42,8 +65,17 @@ def start_session(
         ValidationException: If member cannot start session
         ConflictException: If member already has active session
     """
-    # Validate member exists
-    member = members_service.get_member_by_id(db, member_id)
+    # Lock the member row for the duration of this transaction. The
+    # "no other active session" rule below is check-then-insert: two
+    # concurrent starts for the same member could both pass the check
+    # and create duplicate active sessions. FOR UPDATE serializes starts
+    # per member (the second waits, then sees the first's session) while
+    # starts for different members stay fully concurrent; commit
+    # releases the lock. SQLite ignores FOR UPDATE, where its
+    # single-writer model covers the same race.
+    member = (await db.execute(
+        select(Member).where(Member.id == member_id).with_for_update()
+    )).scalars().first()
     if not member:
         raise NotFoundException("Member", member_id)
 
@@ -59,45 +91,62 @@ def start_session(
             f"Member has no remaining hours. Current balance: {member.balance_hours}"
         )
 
-    # Check if member already has an active session
-    active_session = db.query(GamingSession).filter(
-        GamingSession.member_id == member_id,
-        GamingSession.end_time.is_(None)
-    ).first()
-
-    if active_session:
-        raise ConflictException(
-            f"Member already has an active session (started at {active_session.start_time})",
+    # Sessions must carry a branch (NOT NULL); the member's preferred
+    # branch is the only branch signal on this path
+    if member.branch_preferred_id is None:
+        raise ValidationException(
+            "Member has no preferred branch; assign one before starting sessions",
             field="member_id"
         )
 
     # Create new session
+    now = datetime.utcnow()
     session = GamingSession(
         member_id=member_id,
-        start_time=datetime.utcnow(),
-        station_id=station_id,
-        notes=notes
+        mobile=member.mobile,
+        branch_id=member.branch_preferred_id,
+        date=now.date(),
+        time_start=now,
+        table_number=station_id or "Unassigned",
+        game_title=game_title or "Unspecified",
+        guru_assigned=guru_assigned or "Unassigned",
+        created_by=created_by
     )
 
     db.add(session)
-    db.commit()
-    db.refresh(session)
+
+    # No pre-SELECT for a duplicate active session: the partial unique
+    # index (uq_gaming_sessions_one_active, member_id WHERE open)
+    # performs that check in-index during the INSERT - one round-trip
+    # cheaper and atomic under any interleaving of concurrent starts
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ConflictException(
+            "Member already has an active session",
+            field="member_id"
+        )
+
+    # A new session changes the cached list totals, the cached
+    # active-sessions list and the dashboard aggregates
+    invalidate_count_cache(_COUNT_PREFIX)
+    invalidate_dashboard_cache()
 
     return session
 
 
-def end_session(
-    db: Session,
+async def end_session(
+    db: AsyncSession,
     session_id: str,
-    manual_hours: Optional[Decimal] = None,
-    notes: Optional[str] = None
+    manual_hours: Optional[Decimal] = None
 ) -> GamingSession:
     """
     End an active gaming session and deduct hours from member's balance.
 
     Hour Calculation:
     - If manual_hours provided: use that value (admin override)
-    - Otherwise: calculate from start_time to end_time (in hours, rounded to 2 decimals)
+    - Otherwise: calculate from time_start to time_end (in hours, rounded to 2 decimals)
 
     Deduction Logic:
     - Hours are deducted from member's total_hours_used
@@ -105,10 +154,9 @@ def end_session(
     - If calculated hours exceed member's balance, use all remaining balance
 
     Args:
-        db: Database session
+        db: Async database session
         session_id: Session ID to end
         manual_hours: Optional manual hour override (admin only)
-        notes: Optional additional notes
 
     Returns:
         GamingSession: Updated session instance
@@ -117,23 +165,37 @@ def end_session(
         NotFoundException: If session not found
         ValidationException: If session already ended
     """
-    session = db.query(GamingSession).filter(GamingSession.id == session_id).first()
+    # One joined SELECT brings back the session and its member together
+    # instead of two sequential round-trips (joinedload on a many-to-one
+    # is a single JOIN, no extra query). FOR UPDATE locks both rows:
+    # the "already ended" check below is check-then-write, so two
+    # concurrent end calls could otherwise both pass it and deduct the
+    # member's hours twice - the second now waits and sees end_time set.
+    # innerjoin is required for the lock (Postgres rejects FOR UPDATE on
+    # the nullable side of an outer join) and safe because the member FK
+    # is non-nullable. SQLite ignores FOR UPDATE; its single-writer
+    # model covers the same race.
+    session = (await db.execute(
+        select(GamingSession)
+        .options(joinedload(GamingSession.member, innerjoin=True))
+        .where(GamingSession.id == session_id)
+        .with_for_update()
+    )).scalars().first()
     if not session:
         raise NotFoundException("Session", session_id)
 
     # Check if session already ended
-    if session.end_time is not None:
+    if session.time_end is not None:
         raise ValidationException(
-            f"Session already ended at {session.end_time}"
+            f"Session already ended at {session.time_end}"
         )
 
-    # Get member
-    member = members_service.get_member_by_id(db, session.member_id)
-    if not member:
-        raise NotFoundException("Member", session.member_id)
+    # Member came back with the session; the FK is non-nullable, so it
+    # is always present
+    member = session.member
 
     # Set end time
-    session.end_time = datetime.utcnow()
+    session.time_end = datetime.utcnow()
 
     # Calculate hours
     if manual_hours is not None:
@@ -141,7 +203,7 @@ def end_session(
         hours_to_deduct = manual_hours
     else:
         # Calculate from time difference
-        duration = session.end_time - session.start_time
+        duration = session.time_end - session.time_start
         hours_to_deduct = Decimal(str(round(duration.total_seconds() / 3600, 2)))
 
     # Don't deduct more than member's balance
@@ -153,148 +215,244 @@ def end_session(
         hours_to_deduct = Decimal("0.0")
 
     # Set hours and deduct from member
-    session.hours_used = hours_to_deduct
+    session.hours_consumed = hours_to_deduct
+    session.status = SessionStatus.COMPLETED
 
     # Deduct hours from member's balance
     member.total_hours_used += hours_to_deduct
 
-    # Append notes if provided
-    if notes:
-        if session.notes:
-            session.notes += f"\n{notes}"
-        else:
-            session.notes = notes
+    await db.commit()
 
-    db.commit()
-    db.refresh(session)
-    db.refresh(member)
+    # Ending a session moves it out of the active-only totals and
+    # changes hours-used aggregates and the cached active list
+    invalidate_count_cache(_COUNT_PREFIX)
+    invalidate_dashboard_cache()
 
     return session
 
 
-def get_session_by_id(db: Session, session_id: str) -> Optional[GamingSession]:
+async def get_session_by_id(db: AsyncSession, session_id: str) -> Optional[GamingSession]:
     """Get session by ID."""
-    return db.query(GamingSession).filter(GamingSession.id == session_id).first()
+    return await db.get(GamingSession, session_id)
 
 
-def get_member_sessions(
-    db: Session,
+async def get_member_sessions(
+    db: AsyncSession,
     member_id: str,
     page: int = 1,
-    page_size: int = 50
-) -> Tuple[list[GamingSession], int]:
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False
+) -> Tuple[list[GamingSession], Optional[int], Optional[str]]:
     """
     Get all sessions for a member with pagination.
 
+    Same dual pagination modes as list_sessions (to which this
+    delegates): offset by default, keyset when use_cursor/cursor is set.
+
     Args:
-        db: Database session
+        db: Async database session
         member_id: Member ID
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, offset mode only)
         page_size: Number of items per page
+        cursor: Opaque cursor from a previous keyset page (optional)
+        use_cursor: Use keyset pagination for the first page
 
     Returns:
-        Tuple[list[GamingSession], int]: List of sessions and total count
+        (sessions, total, next_cursor): total is None in keyset mode;
+        next_cursor is None in offset mode or on the last keyset page
     """
-    query = db.query(GamingSession).filter(GamingSession.member_id == member_id)
+    return await list_sessions(
+        db,
+        member_id=member_id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor
+    )
 
-    total = query.count()
 
-    offset = (page - 1) * page_size
-    sessions = query.order_by(GamingSession.start_time.desc()).offset(offset).limit(page_size).all()
+@cached_aggregate("active_sessions", ttl=30)
+async def get_active_sessions(db: AsyncSession) -> list[dict]:
+    """
+    Get all currently active sessions with their member details.
 
-    return sessions, total
+    The monitoring dashboard polls this endpoint constantly with an
+    identical query, and the result only changes on session start/end -
+    a textbook cache-aside read. Results are cached for 30s and both
+    write paths invalidate eagerly, so staleness only covers the
+    stampede window.
 
-
-def get_active_sessions(db: Session) -> list[GamingSession]:
-    """
-    Get all currently active sessions.
+    The member relationship is eager-loaded with selectinload (one extra
+    query for the whole batch), so building the per-session member
+    fields never lazy-loads - 2 queries total instead of N+1. Only
+    member is loaded; the member's purchases/sessions stay unloaded.
 
     Returns:
-        list[GamingSession]: List of active sessions
+        list[dict]: Serialized active sessions, most recent start last
     """
-    return db.query(GamingSession).filter(
-        GamingSession.end_time.is_(None)
-    ).order_by(GamingSession.start_time.asc()).all()
-
-
-def list_sessions(
-    db: Session,
+    sessions = (await db.execute(
+        select(GamingSession)
+        .options(selectinload(GamingSession.member))
+        .where(GamingSession.time_end.is_(None))
+        .order_by(GamingSession.time_start.asc())
+    )).scalars().all()
+
+    now = datetime.utcnow()
+    return [
+        {
+            "session_id": s.id,
+            "member_id": s.member_id,
+            "member_name": s.member.full_name,
+            "member_mobile": s.member.mobile,
+            "member_balance": s.member.balance_hours,
+            # Wire names stay start_time/station_id (the response
+            # contract); the model columns are time_start/table_number
+            "start_time": s.time_start,
+            "duration_minutes": int((now - s.time_start).total_seconds() // 60),
+            "station_id": s.table_number
+        }
+        for s in sessions
+    ]
+
+
+async def list_sessions(
+    db: AsyncSession,
     member_id: Optional[str] = None,
     active_only: bool = False,
     page: int = 1,
-    page_size: int = 50
-) -> Tuple[list[GamingSession], int]:
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False
+) -> Tuple[list[GamingSession], Optional[int], Optional[str]]:
     """
     List all sessions with optional filters.
 
+    Two pagination modes (see members_service.search_members):
+    - Legacy offset mode (default): COUNT per page, total returned.
+    - Keyset mode (use_cursor=True or a cursor given): seeks past the
+      (time_start, id) of the last row seen; no COUNT, deep pages stay
+      cheap, and a next_cursor is returned while more rows exist.
+
     Args:
-        db: Database session
+        db: Async database session
         member_id: Optional filter by member
         active_only: Filter only active sessions (not ended)
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, offset mode only)
         page_size: Number of items per page
+        cursor: Opaque cursor from a previous keyset page (optional)
+        use_cursor: Use keyset pagination for the first page
 
     Returns:
-        Tuple[list[GamingSession], int]: List of sessions and total count
-    """
-    query = db.query(GamingSession)
+        (sessions, total, next_cursor): total is None in keyset mode;
+        next_cursor is None in offset mode or on the last keyset page
 
-    # Apply filters
+    Raises:
+        ValidationException: If the cursor is malformed
+    """
+    filters = []
     if member_id:
-        query = query.filter(GamingSession.member_id == member_id)
-
+        filters.append(GamingSession.member_id == member_id)
     if active_only:
-        query = query.filter(GamingSession.end_time.is_(None))
-
-    total = query.count()
+        filters.append(GamingSession.time_end.is_(None))
+
+    stmt = select(GamingSession).where(*filters)
+
+    if use_cursor or cursor:
+        if cursor:
+            try:
+                last_start_time, last_id = decode_cursor(cursor)
+            except ValueError as exc:
+                raise ValidationException(str(exc), field="cursor")
+            stmt = stmt.where(
+                tuple_(GamingSession.time_start, GamingSession.id) < (last_start_time, last_id)
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        sessions = (await db.execute(
+            stmt.order_by(
+                GamingSession.time_start.desc(), GamingSession.id.desc()
+            ).limit(page_size + 1)
+        )).scalars().all()
+
+        next_cursor = None
+        if len(sessions) > page_size:
+            sessions = sessions[:page_size]
+            last = sessions[-1]
+            next_cursor = encode_cursor(last.time_start, last.id)
+
+        return sessions, None, next_cursor
+
+    # COUNT(*) is the expensive half of offset pagination; totals change
+    # slowly, so serve them from the short-TTL count cache (invalidated
+    # by start_session/end_session)
+    count_key = f"{_COUNT_PREFIX}member={member_id}:active={active_only}"
+    total = get_cached_count(count_key)
+    if total is None:
+        total = (await db.execute(
+            select(func.count()).select_from(GamingSession).where(*filters)
+        )).scalar()
+        store_cached_count(count_key, total, ttl=60)
 
     # Pagination
     offset = (page - 1) * page_size
-    sessions = query.order_by(GamingSession.start_time.desc()).offset(offset).limit(page_size).all()
+    sessions = (await db.execute(
+        stmt.order_by(GamingSession.time_start.desc()).offset(offset).limit(page_size)
+    )).scalars().all()
 
-    return sessions, total
+    return sessions, total, None
 
 
-def get_session_stats(db: Session, member_id: Optional[str] = None) -> dict:
+@cached_aggregate("session_stats", ttl=300)
+async def get_session_stats(db: AsyncSession, member_id: Optional[str] = None) -> dict:
     """
     Get session statistics.
 
+    All four scalar aggregates come back in one round-trip (COUNT, SUM,
+    active-count via SUM(CASE), AVG - a single pass over the filtered
+    rows instead of four separate scans), and busiest_hour is computed
+    in SQL with a GROUP BY hour-of-day LIMIT 1 rather than pulling rows
+    into Python. Results are cached for 5 minutes: stats tolerate
+    staleness and the queries scan the whole session history.
+
     Args:
-        db: Database session
+        db: Async database session
         member_id: Optional filter by member
 
     Returns:
         dict: Session statistics
     """
-    query = db.query(GamingSession)
-
+    filters = []
     if member_id:
-        query = query.filter(GamingSession.member_id == member_id)
-
-    # Total sessions
-    total_sessions = query.count()
-
-    # Total hours used (only completed sessions)
-    total_hours = db.query(func.sum(GamingSession.hours_used)).filter(
-        GamingSession.hours_used.isnot(None)
-    ).scalar() or Decimal("0.0")
-
-    # Active sessions
-    active_sessions = query.filter(GamingSession.end_time.is_(None)).count()
-
-    # Average session duration
-    avg_duration = db.query(func.avg(GamingSession.hours_used)).filter(
-        GamingSession.hours_used.isnot(None)
-    ).scalar() or Decimal("0.0")
-
-    # Busiest hour (hour of day with most sessions)
-    # This is a simplified version - in production, you'd want more sophisticated analytics
-    busiest_hour = None
+        filters.append(GamingSession.member_id == member_id)
+
+    total_sessions, total_hours, active_sessions, avg_duration = (await db.execute(
+        select(
+            func.count(),
+            func.sum(GamingSession.hours_consumed),
+            func.sum(case((GamingSession.time_end.is_(None), 1), else_=0)),
+            func.avg(GamingSession.hours_consumed)
+        ).select_from(GamingSession).where(*filters)
+    )).one()
+
+    # Hour of day with the most session starts; extract('hour') compiles
+    # to EXTRACT on Postgres and strftime('%H') on SQLite. One grouped
+    # row returned instead of the whole table.
+    start_hour = extract("hour", GamingSession.time_start).label("h")
+    busiest = (await db.execute(
+        select(start_hour, func.count().label("n"))
+        .select_from(GamingSession)
+        .where(*filters)
+        .group_by(start_hour)
+        .order_by(func.count().desc())
+        .limit(1)
+    )).first()
 
     return {
         "total_sessions": total_sessions,
-        "total_hours_used": Decimal(str(total_hours)),
-        "active_sessions": active_sessions,
-        "average_session_duration": Decimal(str(avg_duration)) if avg_duration else Decimal("0.0"),
-        "busiest_hour": busiest_hour
+        "total_hours_used": as_decimal(total_hours),
+        "active_sessions": active_sessions or 0,
+        # AVG comes back as float on SQLite; as_decimal re-parses only then
+        "average_session_duration": as_decimal(avg_duration),
+        "busiest_hour": int(busiest.h) if busiest else None
     }
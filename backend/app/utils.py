@@ -1,13 +1,33 @@
 """
 Utility functions for UNTANGLE.
 """
-import re
+import base64
+import binascii
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Tuple, Union
 
+# Deletion table for str.translate: strips every latin-1 character that
+# isn't an ASCII digit. Built once at import; translate is a single
+# C-level table lookup per character, so the hot validation path pays
+# no regex-engine overhead per call. Characters above latin-1 pass
+# through the table untouched and are handled by the slow path below.
+_NON_DIGIT_TRANS = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789')
+)
 
+
+@lru_cache(maxsize=4096)
 def normalize_mobile(mobile: str) -> str:
     """
     Normalize mobile number to 10-digit format.
 
+    Pure function, so results are memoized: the same raw number is
+    normalized on lookup, create and update paths within a request, and
+    regulars' numbers recur across requests. Failed normalizations are
+    not cached (lru_cache never caches raising calls).
+
     Removes all non-digit characters and extracts the last 10 digits.
     Handles formats like:
     - "+639171234567" -> "9171234567"
@@ -23,8 +43,12 @@ def normalize_mobile(mobile: str) -> str:
     Raises:
         ValueError: If mobile number is invalid
     """
-    # Remove all non-digit characters
-    digits = re.sub(r'\D', '', mobile)
+    # Remove all non-digit characters (precompiled translate table; see
+    # _NON_DIGIT_TRANS). Inputs with characters beyond latin-1 fall back
+    # to a per-character filter - effectively never on real numbers.
+    digits = mobile.translate(_NON_DIGIT_TRANS)
+    if digits and not digits.isascii():
+        digits = ''.join(ch for ch in digits if ch in '0123456789')
 
     # Handle country code (63)
     if digits.startswith('63'):
@@ -42,3 +66,67 @@ def normalize_mobile(mobile: str) -> str:
         raise ValueError(f"Invalid mobile number: {mobile}. Must be 10 digits after normalization.")
 
     return normalized
+
+
+def as_decimal(value: Union[Decimal, int, float, str, None]) -> Decimal:
+    """
+    Coerce an aggregate result to Decimal without a needless round-trip.
+
+    DECIMAL-typed columns already come back from the driver as Decimal,
+    so the common case is a single isinstance check. Only untyped
+    aggregates (e.g. AVG on SQLite, which yields a float) take the
+    str-parse path, which also keeps float inputs exact-looking instead
+    of exposing their binary expansion.
+
+    Args:
+        value: Aggregate result from the database (None for empty sets)
+
+    Returns:
+        The value as a Decimal; None becomes Decimal("0.0")
+    """
+    if isinstance(value, Decimal):
+        return value
+    if value is None:
+        return Decimal("0.0")
+    return Decimal(str(value))
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """
+    Encode a keyset-pagination cursor.
+
+    The cursor is the (sort column, id) pair of the last row on a page,
+    base64-encoded so clients treat it as an opaque token.
+
+    Args:
+        sort_value: Sort-column value of the last row (a datetime)
+        row_id: ID of the last row
+
+    Returns:
+        URL-safe opaque cursor string
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a keyset-pagination cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+
+    Returns:
+        (sort value, row id) pair of the last row already seen
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_part, _, row_id = raw.partition("|")
+        if not row_id:
+            raise ValueError
+        return datetime.fromisoformat(sort_part), row_id
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
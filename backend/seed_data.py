@@ -26,8 +26,21 @@ def create_test_data():
     db = SessionLocal()
 
     try:
+        # start.py runs this on every boot; on a warm restart the data is
+        # already there and every insert would fail its unique constraint.
+        # One cheap existence probe replaces ~20 doomed round-trips.
+        if db.query(User.id).filter_by(email="admin@untangle.com").first():
+            print("Seed data already present, skipping.")
+            return
+
         print("Seeding database with test data...")
 
+        # Everything below is staged in the one session and committed
+        # once at the end: a single transaction (one WAL fsync) instead
+        # of a commit round-trip per row. IDs are precomputed in Python,
+        # so nothing needs a refresh to be referenced.
+        now = datetime.utcnow()
+
         # 1. Create Branch
         print("\n[1/7] Creating test branch...")
         branch = Branch(
@@ -36,11 +49,10 @@ def create_test_data():
             location="123 Ayala Avenue, Makati City",
             total_stations=10,
             is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(branch)
-        db.commit()
         print(f"   OK: Branch created - {branch.name}")
 
         # 2. Create Admin User
@@ -55,11 +67,10 @@ def create_test_data():
             is_active=True,
             is_verified=True,
             oauth_provider=None,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(admin)
-        db.commit()
         print(f"   OK: {admin.email} (password: password123)")
 
         # 3. Create Manager User
@@ -73,11 +84,10 @@ def create_test_data():
             branch_id=branch.id,
             is_active=True,
             is_verified=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(manager)
-        db.commit()
         print(f"   OK: {manager.email} (password: password123)")
 
         # 4. Create Staff User
@@ -91,13 +101,19 @@ def create_test_data():
             branch_id=branch.id,
             is_active=True,
             is_verified=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(staff)
-        db.commit()
         print(f"   OK: {staff.email} (password: password123)")
 
+        # Branch and users above stay on the ORM path (a handful of
+        # rows, and the instances are handy); everything below goes in
+        # as plain mappings via bulk_insert_mappings, which skips
+        # identity-map and attribute-history bookkeeping per row.
+        # Flush first so the FK targets exist before the bulk inserts.
+        db.flush()
+
         # 5. Create Test Members
         print("\n[5/7] Creating test members...")
         members_data = [
@@ -111,53 +127,54 @@ def create_test_data():
         members = []
         for data in members_data:
             registration_date = date.today() - timedelta(days=data["days_ago"])
-            member = Member(
-                id=str(uuid.uuid4()),
-                full_name=data["full_name"],
-                mobile=data["mobile"],
-                email=data["email"],
-                branch_preferred_id=branch.id,
-                total_hours_granted=Decimal("0"),
-                total_hours_used=Decimal("0"),
-                expiry_date=None,
-                registration_date=registration_date,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(member)
-            db.commit()
-            db.refresh(member)
+            # hours/amount are ints, so Decimal(int) is exact - no need
+            # for the str round-trip - and one coercion serves every use
+            data["hours_dec"] = Decimal(data["hours"])
+            data["amount_dec"] = Decimal(data["amount"])
+            member = {
+                "id": str(uuid.uuid4()),
+                "full_name": data["full_name"],
+                "mobile": data["mobile"],
+                "email": data["email"],
+                "branch_preferred_id": branch.id,
+                "total_hours_granted": Decimal("0"),
+                "total_hours_used": Decimal("0"),
+                "expiry_date": None,
+                "registration_date": registration_date,
+                "created_at": now,
+                "updated_at": now
+            }
             members.append((member, data))
-            print(f"   OK: {member.full_name} - {member.mobile}")
+            print(f"   OK: {member['full_name']} - {member['mobile']}")
 
         # 6. Create Purchases
         print("\n[6/7] Creating purchases...")
+        purchase_rows = []
         for member, data in members:
             purchase_date_dt = datetime.combine(date.today() - timedelta(days=data["days_ago"]), datetime.min.time())
             expiry_date = purchase_date_dt.date() + timedelta(days=365)
             rollover_deadline = expiry_date + timedelta(days=180)
 
-            purchase = Purchase(
-                id=str(uuid.uuid4()),
-                member_id=member.id,
-                mobile=member.mobile,
-                plan_name=f"{data['hours']} Hours Plan",
-                amount_paid=Decimal(str(data["amount"])),
-                hours_granted=Decimal(str(data["hours"])),
-                total_valid_purchased=Decimal(str(data["hours"])),
-                purchase_date=purchase_date_dt,
-                expiry_date=expiry_date,
-                rollover_deadline=rollover_deadline,
-                rollover_status="pending",
-                created_by=admin.id,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(purchase)
-            member.total_hours_granted += Decimal(str(data["hours"]))
-            member.expiry_date = expiry_date
-            db.commit()
-            print(f"   OK: {data['hours']}h for {member.full_name} - PHP{data['amount']}")
+            purchase_rows.append({
+                "id": str(uuid.uuid4()),
+                "member_id": member["id"],
+                "mobile": member["mobile"],
+                "branch_id": branch.id,
+                "plan_name": f"{data['hours']} Hours Plan",
+                "amount_paid": data["amount_dec"],
+                "hours_granted": data["hours_dec"],
+                "total_valid_purchased": data["hours_dec"],
+                "purchase_date": purchase_date_dt,
+                "expiry_date": expiry_date,
+                "rollover_deadline": rollover_deadline,
+                "rollover_status": "pending",
+                "created_by": admin.id,
+                "created_at": now,
+                "updated_at": now
+            })
+            member["total_hours_granted"] += data["hours_dec"]
+            member["expiry_date"] = expiry_date
+            print(f"   OK: {data['hours']}h for {member['full_name']} - PHP{data['amount']}")
 
         # 7. Create Gaming Sessions
         print("\n[7/7] Creating gaming sessions...")
@@ -165,26 +182,24 @@ def create_test_data():
         # Active session
         session_date = date.today()
         time_start = datetime.utcnow() - timedelta(hours=2)
-        active = GamingSession(
-            id=str(uuid.uuid4()),
-            member_id=members[0][0].id,
-            mobile=members[0][0].mobile,
-            branch_id=branch.id,
-            date=session_date,
-            time_start=time_start,
-            time_end=None,
-            hours_consumed=Decimal("0.0"),
-            table_number="PC-01",
-            game_title="Valorant",
-            guru_assigned=staff.full_name,
-            status="active",
-            created_by=staff.id,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        db.add(active)
-        db.commit()
-        print(f"   OK: ACTIVE - {members[0][0].full_name} at PC-01")
+        session_rows = [{
+            "id": str(uuid.uuid4()),
+            "member_id": members[0][0]["id"],
+            "mobile": members[0][0]["mobile"],
+            "branch_id": branch.id,
+            "date": session_date,
+            "time_start": time_start,
+            "time_end": None,
+            "hours_consumed": Decimal("0.0"),
+            "table_number": "PC-01",
+            "game_title": "Valorant",
+            "guru_assigned": staff.full_name,
+            "status": "active",
+            "created_by": staff.id,
+            "created_at": now,
+            "updated_at": now
+        }]
+        print(f"   OK: ACTIVE - {members[0][0]['full_name']} at PC-01")
 
         # Completed sessions
         sessions_data = [
@@ -201,28 +216,37 @@ def create_test_data():
             sess_date = date.today() - timedelta(days=days_ago)
             start = datetime.combine(sess_date, datetime.min.time()) + timedelta(hours=10)  # 10 AM
             end = start + timedelta(hours=hours)
+            # hours is a float literal here, so the str form keeps the
+            # exact written value; coerce once for both uses below
+            hours_dec = Decimal(str(hours))
+
+            session_rows.append({
+                "id": str(uuid.uuid4()),
+                "member_id": member["id"],
+                "mobile": member["mobile"],
+                "branch_id": branch.id,
+                "date": sess_date,
+                "time_start": start,
+                "time_end": end,
+                "hours_consumed": hours_dec,
+                "table_number": table_num,
+                "game_title": game,
+                "guru_assigned": staff.full_name,
+                "status": "completed",
+                "created_by": staff.id,
+                "created_at": start,
+                "updated_at": end
+            })
+            member["total_hours_used"] += hours_dec
+            print(f"   OK: {member['full_name']} - {hours}h at {table_num}")
 
-            session = GamingSession(
-                id=str(uuid.uuid4()),
-                member_id=member.id,
-                mobile=member.mobile,
-                branch_id=branch.id,
-                date=sess_date,
-                time_start=start,
-                time_end=end,
-                hours_consumed=Decimal(str(hours)),
-                table_number=table_num,
-                game_title=game,
-                guru_assigned=staff.full_name,
-                status="completed",
-                created_by=staff.id,
-                created_at=start,
-                updated_at=end
-            )
-            db.add(session)
-            member.total_hours_used += Decimal(str(hours))
-            db.commit()
-            print(f"   OK: {member.full_name} - {hours}h at {table_num}")
+        # Totals are final now that every purchase/session is tallied;
+        # insert each table with one executemany, then one commit for
+        # the whole dataset
+        db.bulk_insert_mappings(Member, [m for m, _ in members])
+        db.bulk_insert_mappings(Purchase, purchase_rows)
+        db.bulk_insert_mappings(GamingSession, session_rows)
+        db.commit()
 
         print("\n" + "="*60)
         print("SUCCESS! Database seeded with test data")
@@ -242,8 +266,8 @@ def create_test_data():
 
         print("\nTEST MEMBERS:")
         for member, _ in members:
-            balance = member.total_hours_granted - member.total_hours_used
-            print(f"  {member.full_name:20} | {member.mobile} | Balance: {balance}h")
+            balance = member["total_hours_granted"] - member["total_hours_used"]
+            print(f"  {member['full_name']:20} | {member['mobile']} | Balance: {balance}h")
 
         print("\nNEXT STEPS:")
         print("  1. Visit: http://localhost:8000/docs")
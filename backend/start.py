@@ -14,22 +14,15 @@ def run_command(description, command, allow_failure=False):
     print(f"{'='*50}")
 
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
+        # No capture_output: the child inherits our streams, so long
+        # migrations print live instead of buffering their whole output
+        # in memory first. An argv list also skips the /bin/sh fork that
+        # shell=True costs per step.
+        subprocess.run(command.split(), check=True)
         print(f"✓ {description} completed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"⚠ {description} failed:")
-        print(e.stdout)
-        print(e.stderr)
+    except subprocess.CalledProcessError:
+        print(f"⚠ {description} failed (exit code above)")
         if not allow_failure:
             print(f"✗ Critical error in {description}")
             sys.exit(1)
@@ -62,10 +55,21 @@ def main():
     print("="*50)
 
     port = os.getenv("PORT", "8000")
-    cmd = f"uvicorn app.main:app --host 0.0.0.0 --port {port}"
+    # Worker count is deployment-tunable; each worker gets its own
+    # connection pool, so keep (pool_size + max_overflow) * workers
+    # under the database's max_connections (see app/database.py).
+    workers = os.getenv("WEB_CONCURRENCY", "1")
+    cmd = f"uvicorn app.main:app --host 0.0.0.0 --port {port} --workers {workers}"
 
     print(f"Running: {cmd}")
-    os.execvp("uvicorn", ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", port])
+    # exec replaces this process; flush our buffers first so nothing
+    # printed above is lost
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(
+        "uvicorn",
+        ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", port, "--workers", workers]
+    )
 
 if __name__ == "__main__":
     main()
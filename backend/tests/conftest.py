@@ -0,0 +1,164 @@
+"""
+Shared pytest fixtures.
+
+The app is pointed at a throwaway SQLite file before any app module is
+imported, so both the sync and async engines bind to it. Auth is
+replaced with a stub admin user - the API tests exercise endpoint
+behavior, not the JWT stack.
+"""
+import os
+import uuid
+
+# Must be set before app.config is imported anywhere
+os.environ["DATABASE_URL"] = "sqlite:///./test_untangle.db"
+os.environ.setdefault("ENVIRONMENT", "development")
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.dependencies import get_current_user
+from app.main import app
+from app.models.branch import Branch
+from app.models.member import Member
+from app.models.purchase import Purchase
+from app.models.session import GamingSession
+from app.models.user import User
+
+
+def _stub_admin() -> User:
+    """Detached admin user standing in for the JWT-authenticated caller."""
+    return User(
+        id=str(uuid.uuid4()),
+        email="tests@untangle.com",
+        hashed_password="x",
+        full_name="Test Admin",
+        role="admin",
+        is_active=True
+    )
+
+
+@pytest.fixture(scope="session")
+def seeded_ids() -> dict:
+    """Create the schema and a minimal fixture dataset; return its ids."""
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        branch_id = str(uuid.uuid4())
+        user_id = str(uuid.uuid4())
+        member_id = str(uuid.uuid4())
+        idle_member_id = str(uuid.uuid4())
+        purchase_id = str(uuid.uuid4())
+
+        db.add(Branch(
+            id=branch_id,
+            name="Test Branch",
+            location="Test City",
+            total_stations=5,
+            is_active=True,
+            created_at=now,
+            updated_at=now
+        ))
+        db.add(Member(
+            id=member_id,
+            full_name="Fixture Member",
+            mobile="9170000001",
+            branch_preferred_id=branch_id,
+            total_hours_granted=Decimal("10.00"),
+            total_hours_used=Decimal("3.50"),
+            expiry_date=date.today() + timedelta(days=365),
+            registration_date=date.today(),
+            created_at=now,
+            updated_at=now
+        ))
+        # Second member with balance and no sessions, for the
+        # start/end-session flow tests
+        db.add(Member(
+            id=idle_member_id,
+            full_name="Idle Member",
+            mobile="9170000002",
+            branch_preferred_id=branch_id,
+            total_hours_granted=Decimal("10.00"),
+            total_hours_used=Decimal("0.00"),
+            expiry_date=date.today() + timedelta(days=365),
+            registration_date=date.today(),
+            created_at=now,
+            updated_at=now
+        ))
+        # The fixture member's purchase backing the granted hours
+        db.add(Purchase(
+            id=purchase_id,
+            member_id=member_id,
+            mobile="9170000001",
+            branch_id=branch_id,
+            plan_name="10 Hours Plan",
+            amount_paid=Decimal("1000.00"),
+            hours_granted=Decimal("10.00"),
+            total_valid_purchased=Decimal("10.00"),
+            purchase_date=now,
+            expiry_date=date.today() + timedelta(days=365),
+            rollover_deadline=date.today() + timedelta(days=545),
+            created_by=user_id,
+            created_at=now,
+            updated_at=now
+        ))
+        # One completed session and one still open
+        db.add(GamingSession(
+            id=str(uuid.uuid4()),
+            member_id=member_id,
+            mobile="9170000001",
+            branch_id=branch_id,
+            date=date.today(),
+            time_start=now.replace(hour=10, minute=0) - timedelta(days=1),
+            time_end=now.replace(hour=13, minute=30) - timedelta(days=1),
+            hours_consumed=Decimal("3.50"),
+            table_number="PC-01",
+            game_title="Valorant",
+            guru_assigned="Test Staff",
+            status="completed",
+            created_by=user_id,
+            created_at=now,
+            updated_at=now
+        ))
+        db.add(GamingSession(
+            id=str(uuid.uuid4()),
+            member_id=member_id,
+            mobile="9170000001",
+            branch_id=branch_id,
+            date=date.today(),
+            time_start=now - timedelta(hours=1),
+            time_end=None,
+            hours_consumed=Decimal("0.00"),
+            table_number="PC-02",
+            game_title="Dota 2",
+            guru_assigned="Test Staff",
+            status="active",
+            created_by=user_id,
+            created_at=now,
+            updated_at=now
+        ))
+        db.commit()
+        yield {
+            "branch_id": branch_id,
+            "member_id": member_id,
+            "idle_member_id": idle_member_id,
+            "purchase_id": purchase_id
+        }
+    finally:
+        db.close()
+        engine.dispose()
+        if os.path.exists("test_untangle.db"):
+            os.remove("test_untangle.db")
+
+
+@pytest.fixture(scope="session")
+def client(seeded_ids) -> TestClient:
+    """TestClient with auth stubbed out."""
+    app.dependency_overrides[get_current_user] = _stub_admin
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,16 @@
+"""
+Smoke tests for the dashboard endpoints.
+"""
+from decimal import Decimal
+
+
+def test_revenue_stats_smoke(client, seeded_ids):
+    """GET /dashboard/revenue returns the aggregates, not a 500."""
+    response = client.get("/api/v1/dashboard/revenue")
+    assert response.status_code == 200
+
+    stats = response.json()
+    assert Decimal(stats["total_revenue"]) >= Decimal("1000.00")
+    assert stats["total_purchases"] >= 1
+    # No payment column on Purchase yet, so the breakdown is empty
+    assert stats["payment_methods"] == {}
@@ -0,0 +1,77 @@
+"""
+Smoke tests for the member endpoints.
+"""
+from decimal import Decimal
+
+
+def test_get_member_by_id(client, seeded_ids):
+    """GET /members/{id} serializes a real row, not a 500."""
+    response = client.get(f"/api/v1/members/{seeded_ids['member_id']}")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["id"] == seeded_ids["member_id"]
+    assert body["full_name"] == "Fixture Member"
+    assert body["mobile"] == "9170000001"
+    # Wire name branch_id is read from branch_preferred_id
+    assert body["branch_id"] == seeded_ids["branch_id"]
+    assert Decimal(body["balance_hours"]) == Decimal("6.50")
+    assert body["is_expired"] is False
+
+
+def test_get_member_by_mobile(client, seeded_ids):
+    """GET /members/mobile/{mobile} normalizes and finds the member."""
+    response = client.get("/api/v1/members/mobile/+639170000001")
+    assert response.status_code == 200
+    assert response.json()["id"] == seeded_ids["member_id"]
+
+
+def test_list_members(client, seeded_ids):
+    """GET /members/ builds list items without phantom fields."""
+    response = client.get("/api/v1/members/")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["total"] >= 2
+    by_mobile = {m["mobile"]: m for m in body["members"]}
+    assert by_mobile["9170000001"]["branch_id"] == seeded_ids["branch_id"]
+
+
+def test_create_member(client, seeded_ids):
+    """POST /members/ persists a row with the real column names."""
+    response = client.post("/api/v1/members/", json={
+        "full_name": "New Member",
+        "mobile": "09170000003",
+        "branch_id": seeded_ids["branch_id"]
+    })
+    assert response.status_code == 201
+
+    body = response.json()
+    assert body["mobile"] == "9170000003"
+    assert body["branch_id"] == seeded_ids["branch_id"]
+    assert Decimal(body["balance_hours"]) == Decimal("0.00")
+
+    # The unique mobile index rejects a duplicate with a 409
+    duplicate = client.post("/api/v1/members/", json={
+        "full_name": "Duplicate Member",
+        "mobile": "+639170000003"
+    })
+    assert duplicate.status_code == 409
+
+
+def test_update_member(client, seeded_ids):
+    """PUT /members/{id} updates the real attributes."""
+    created = client.post("/api/v1/members/", json={
+        "full_name": "Update Target",
+        "mobile": "09170000004"
+    }).json()
+
+    response = client.put(f"/api/v1/members/{created['id']}", json={
+        "full_name": "Updated Name",
+        "branch_id": seeded_ids["branch_id"]
+    })
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["full_name"] == "Updated Name"
+    assert body["branch_id"] == seeded_ids["branch_id"]
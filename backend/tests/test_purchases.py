@@ -0,0 +1,60 @@
+"""
+Smoke tests for the purchase endpoints.
+"""
+from decimal import Decimal
+
+
+def test_get_purchase_by_id(client, seeded_ids):
+    """GET /purchases/{id} serializes a real row, not a 500."""
+    response = client.get(f"/api/v1/purchases/{seeded_ids['purchase_id']}")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["id"] == seeded_ids["purchase_id"]
+    assert body["plan_name"] == "10 Hours Plan"
+    # Wire name hours_purchased is read from hours_granted
+    assert Decimal(body["hours_purchased"]) == Decimal("10.00")
+    assert body["rollover_status"] == "pending"
+
+
+def test_list_purchases(client, seeded_ids):
+    """GET /purchases/ builds list items from the real columns."""
+    response = client.get("/api/v1/purchases/")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["total"] >= 1
+    by_id = {p["id"]: p for p in body["purchases"]}
+    item = by_id[seeded_ids["purchase_id"]]
+    assert Decimal(item["amount_paid"]) == Decimal("1000.00")
+    assert item["rollover_status"] == "pending"
+
+
+def test_create_purchase(client, seeded_ids):
+    """POST /purchases/ persists a row and grants the hours."""
+    before = client.get(
+        f"/api/v1/members/{seeded_ids['idle_member_id']}"
+    ).json()
+
+    response = client.post("/api/v1/purchases/", json={
+        "member_id": seeded_ids["idle_member_id"],
+        "hours_purchased": "5.00",
+        "amount_paid": "500.00"
+    })
+    assert response.status_code == 201
+
+    body = response.json()
+    assert body["member_id"] == seeded_ids["idle_member_id"]
+    assert Decimal(body["hours_purchased"]) == Decimal("5.00")
+    assert body["plan_name"] == "5.00 Hours Plan"
+    assert body["rollover_status"] == "pending"
+
+    # The grant landed on the member
+    after = client.get(
+        f"/api/v1/members/{seeded_ids['idle_member_id']}"
+    ).json()
+    granted_delta = (
+        Decimal(after["total_hours_granted"])
+        - Decimal(before["total_hours_granted"])
+    )
+    assert granted_delta == Decimal("5.00")
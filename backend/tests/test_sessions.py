@@ -0,0 +1,117 @@
+"""
+Smoke tests for the gaming session endpoints.
+"""
+from decimal import Decimal
+
+
+def test_session_stats_smoke(client, seeded_ids):
+    """GET /sessions/stats returns the fused aggregates, not a 500."""
+    response = client.get("/api/v1/sessions/stats")
+    assert response.status_code == 200
+
+    stats = response.json()
+    assert stats["total_sessions"] == 2
+    assert Decimal(stats["total_hours_used"]) == Decimal("3.50")
+    assert stats["active_sessions"] == 1
+    assert Decimal(stats["average_session_duration"]) == Decimal("1.75")
+    assert stats["busiest_hour"] is not None
+
+
+def test_list_sessions(client, seeded_ids):
+    """GET /sessions/ serializes real rows with batched member names."""
+    response = client.get("/api/v1/sessions/")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["total"] == 2
+    assert len(body["sessions"]) == 2
+
+    by_station = {s["station_id"]: s for s in body["sessions"]}
+    assert by_station["PC-01"]["is_active"] is False
+    assert Decimal(by_station["PC-01"]["hours_used"]) == Decimal("3.50")
+    assert by_station["PC-02"]["is_active"] is True
+    assert by_station["PC-02"]["end_time"] is None
+    # Names come from the single IN-list lookup
+    assert by_station["PC-01"]["member_name"] == "Fixture Member"
+
+
+def test_get_session_by_id(client, seeded_ids):
+    """GET /sessions/{id} validates a single row through from_orm."""
+    listing = client.get("/api/v1/sessions/").json()
+    session_id = listing["sessions"][0]["id"]
+
+    response = client.get(f"/api/v1/sessions/{session_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == session_id
+
+
+def test_active_sessions_smoke(client, seeded_ids):
+    """GET /sessions/active returns the open session with member fields."""
+    response = client.get("/api/v1/sessions/active")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert len(body) == 1
+    assert body[0]["member_id"] == seeded_ids["member_id"]
+    assert body[0]["station_id"] == "PC-02"
+    assert body[0]["duration_minutes"] >= 59
+
+
+def test_start_session(client, seeded_ids):
+    """POST /sessions/start persists a row with the real NOT NULL columns."""
+    response = client.post("/api/v1/sessions/start", json={
+        "member_id": seeded_ids["idle_member_id"],
+        "station_id": "PC-09",
+        "game_title": "Tekken 8"
+    })
+    assert response.status_code == 201
+
+    body = response.json()
+    assert body["member_id"] == seeded_ids["idle_member_id"]
+    assert body["station_id"] == "PC-09"
+    assert body["is_active"] is True
+    assert body["end_time"] is None
+
+    # The partial unique index rejects a second open session
+    duplicate = client.post("/api/v1/sessions/start", json={
+        "member_id": seeded_ids["idle_member_id"],
+        "station_id": "PC-10"
+    })
+    assert duplicate.status_code == 409
+
+
+def test_end_session(client, seeded_ids):
+    """PUT /sessions/{id}/end closes the session and deducts hours."""
+    # The start-session test above leaves the idle member with an open
+    # session; find it through the member filter
+    listing = client.get(
+        "/api/v1/sessions/",
+        params={"member_id": seeded_ids["idle_member_id"], "active_only": True}
+    ).json()
+    assert len(listing["sessions"]) == 1
+    session_id = listing["sessions"][0]["id"]
+
+    response = client.put(
+        f"/api/v1/sessions/{session_id}/end",
+        json={"manual_hours": "2.50"}
+    )
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["is_active"] is False
+    assert body["end_time"] is not None
+    assert Decimal(body["hours_used"]) == Decimal("2.50")
+
+    # The deduction landed on the member row
+    from app.database import SessionLocal
+    from app.models.member import Member
+    db = SessionLocal()
+    try:
+        member = db.get(Member, seeded_ids["idle_member_id"])
+        assert member.total_hours_used == Decimal("2.50")
+    finally:
+        db.close()
+
+    # Ending an already-ended session is rejected
+    again = client.put(f"/api/v1/sessions/{session_id}/end", json={})
+    assert again.status_code == 400